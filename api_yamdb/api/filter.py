@@ -1,32 +1,131 @@
+from django.db.models import Case, IntegerField, Value, When
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
+from api_yamdb.settings import TITLE_IDS_MAX
+from reviews.cache import category_cache, genre_cache
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по списку значений через запятую: `genre=drama,comedy`."""
+
+
+def slugs_to_ids(dictionary_cache, slugs):
+    """id записей справочника с указанными slug."""
+    return [
+        obj.pk for obj in map(dictionary_cache.get_by_slug, slugs)
+        if obj is not None
+    ]
 
 
 class TitleFilter(filters.FilterSet):
     """
     Кастомный filter для Title.
+    Категории и жанры фильтруются по точному slug через кеш
+    справочников, год - по точному значению или диапазону:
+    все условия используют индексы.
     """
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
-    )
+    category = CharInFilter(method='filter_category')
+    genre = CharInFilter(method='filter_genre')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
-    year = filters.NumberFilter(
-        field_name='year',
-        lookup_expr='icontains'
-    )
+    year = filters.NumberFilter(field_name='year')
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
 
     class Meta:
         """
         Метаданные.
         """
         model = Title
-        fields = '__all__'
+        fields = ('category', 'genre', 'name', 'year')
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(
+            category_id__in=slugs_to_ids(category_cache, value))
+
+    def filter_genre(self, queryset, name, value):
+        # Подзапрос по промежуточной таблице вместо JOIN:
+        # произведение с несколькими жанрами не дублируется.
+        return queryset.filter(
+            pk__in=Title.genre.through.objects.filter(
+                genre_id__in=slugs_to_ids(genre_cache, value)
+            ).values('title_id')
+        )
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """
+    Сортировка произведений только по индексированным полям.
+    review_count - псевдоним хранимого rating_count;
+    id добавляется для стабильной пагинации при равных значениях.
+    """
+    field_aliases = {'review_count': 'rating_count'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        result = []
+        for term in ordering:
+            name = term.lstrip('-')
+            prefix = term[:len(term) - len(name)]
+            result.append(prefix + self.field_aliases.get(name, name))
+        return [*result, 'id']
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск по названию и описанию: `search=`.
+    Без явного `ordering` результаты упорядочены по релевантности.
+    Должен стоять после OrderingFilter.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        queryset = search_titles(queryset, query)
+        if (OrderingFilter.ordering_param not in request.query_params
+                and 'search_rank' in queryset.query.annotations):
+            queryset = queryset.order_by('search_rank', 'name')
+        return queryset
+
+
+class TitleIdsFilter(BaseFilterBackend):
+    """
+    Пакетная выборка по списку id: `ids=3,1,2`, не больше max_ids.
+    Без явного `ordering` произведения возвращаются в порядке запроса.
+    Должен стоять после OrderingFilter.
+    """
+    ids_param = 'ids'
+    max_ids = TITLE_IDS_MAX
+
+    def filter_queryset(self, request, queryset, view):
+        raw_ids = request.query_params.get(self.ids_param)
+        if raw_ids is None:
+            return queryset
+        try:
+            ids = list(dict.fromkeys(
+                int(value) for value in raw_ids.split(',') if value.strip()))
+        except ValueError:
+            ids = None
+        if not ids or len(ids) > self.max_ids:
+            raise ValidationError({
+                self.ids_param: 'Укажите от 1 до {} id через запятую.'.format(
+                    self.max_ids)
+            })
+        queryset = queryset.filter(pk__in=ids)
+        if OrderingFilter.ordering_param not in request.query_params:
+            queryset = queryset.order_by(Case(
+                *(When(pk=pk, then=Value(position))
+                  for position, pk in enumerate(ids)),
+                output_field=IntegerField(),
+            ))
+        return queryset
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from io import BytesIO
+from timeit import Timer
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.serializers import ReviewSerializer
+from api_yamdb.settings import PAGINATOR_PAGE
+from reviews.models import Review, User
+
+REVIEWS_PAYLOAD_SIZE = 1000
+
+
+def titles_payload(size=PAGINATOR_PAGE):
+    """Страница списка произведений в формате TitleReadSerializer."""
+    return {
+        'count': size,
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': number,
+                'category': {'name': 'Фильм', 'slug': 'movie'},
+                'genre': [
+                    {'name': 'Драма', 'slug': 'drama'},
+                    {'name': 'Комедия', 'slug': 'comedy'},
+                ],
+                'year': 1950 + number,
+                'name': f'Произведение №{number}',
+                'description': 'Описание произведения. ' * 10,
+                'rating': number % 10 + 1,
+            }
+            for number in range(size)
+        ],
+    }
+
+
+def reviews_payload(size=REVIEWS_PAYLOAD_SIZE):
+    """Отзывы, сериализованные ReviewSerializer (с датами pub_date)."""
+    now = timezone.now()
+    authors = [User(username=f'читатель_{number}') for number in range(50)]
+    reviews = [
+        Review(
+            id=number,
+            text='Отличный фильм, пересматривал несколько раз. ' * 5,
+            author=authors[number % len(authors)],
+            score=number % 10 + 1,
+            pub_date=now - timedelta(minutes=number),
+        )
+        for number in range(size)
+    ]
+    return ReviewSerializer(reviews, many=True).data
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендеринга и разбора JSON стандартными '
+        'JSONRenderer/JSONParser и ORJSONRenderer/ORJSONParser.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=200,
+            help='Сколько раз рендерить и разбирать каждый ответ.',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть больше нуля.')
+        repeat = options['repeat']
+        payloads = (
+            (f'{PAGINATOR_PAGE} произведений', titles_payload()),
+            (f'{REVIEWS_PAYLOAD_SIZE} отзывов', reviews_payload()),
+        )
+        for name, data in payloads:
+            content = JSONRenderer().render(data)
+            if ORJSONRenderer().render(data) != content:
+                raise CommandError(f'{name}: ответы рендереров различаются.')
+            self.stdout.write(f'{name}, {len(content)} байт:')
+            for operation, standard, fast in (
+                (
+                    'рендеринг',
+                    lambda: JSONRenderer().render(data),
+                    lambda: ORJSONRenderer().render(data),
+                ),
+                (
+                    'разбор',
+                    lambda: JSONParser().parse(BytesIO(content)),
+                    lambda: ORJSONParser().parse(BytesIO(content)),
+                ),
+            ):
+                standard_time = Timer(standard).timeit(repeat) / repeat
+                fast_time = Timer(fast).timeit(repeat) / repeat
+                self.stdout.write(
+                    f'  {operation}: json {standard_time * 1000:.3f} мс, '
+                    f'orjson {fast_time * 1000:.3f} мс '
+                    f'(x{standard_time / fast_time:.1f})'
+                )
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.management import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+from django.urls import set_urlconf
+from django.utils.module_loading import import_string
+
+# Стек до разделения на API и остальные страницы.
+LEGACY_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+DEFAULT_PATHS = ('/api/v1/titles/', '/admin/login/')
+VIEW_LAYER = 'представление'
+
+
+class TimedLayer:
+    """Слой цепочки, который копит время вместе со всеми слоями ниже."""
+    def __init__(self, name, get_response, timings):
+        self.name = name
+        self.get_response = get_response
+        self.timings = timings
+
+    def __call__(self, request):
+        start = perf_counter()
+        response = self.get_response(request)
+        self.timings[self.name] += perf_counter() - start
+        return response
+
+
+def build_chain(middleware_paths, timings):
+    """
+    Цепочка как в BaseHandler.load_middleware, но каждый middleware
+    обёрнут в TimedLayer. Возвращает цепочку и имена слоёв сверху вниз.
+    """
+    handler = BaseHandler()
+    with override_settings(MIDDLEWARE=[]):
+        handler.load_middleware()
+    chain = TimedLayer(VIEW_LAYER, handler._middleware_chain, timings)
+    names = [VIEW_LAYER]
+    for middleware_path in reversed(middleware_paths):
+        middleware = import_string(middleware_path)
+        try:
+            instance = middleware(chain)
+        except MiddlewareNotUsed:
+            continue
+        name = middleware_path.rsplit('.', 1)[-1]
+        chain = TimedLayer(
+            name, convert_exception_to_response(instance), timings)
+        names.insert(0, name)
+    return chain, names
+
+
+def measure(middleware_paths, path, requests):
+    """
+    Собственное время каждого слоя на запрос в секундах
+    и код ответа последнего запроса.
+    """
+    timings = defaultdict(float)
+    chain, names = build_chain(middleware_paths, timings)
+    factory = RequestFactory()
+    set_urlconf(settings.ROOT_URLCONF)
+    chain(factory.get(path))
+    timings.clear()
+    for _ in range(requests):
+        response = chain(factory.get(path))
+    result = []
+    for number, name in enumerate(names):
+        inner = timings[names[number + 1]] if number + 1 < len(names) else 0
+        result.append((name, (timings[name] - inner) / requests))
+    return result, response.status_code
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет задержку, которую вносит каждый middleware, '
+        'для прежнего стека (LEGACY_MIDDLEWARE) и текущего MIDDLEWARE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Сколько запросов выполнить по каждому пути.',
+        )
+        parser.add_argument(
+            '--path',
+            action='append',
+            help='Путь запроса; можно указать несколько раз.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests должен быть больше нуля.')
+        requests = options['requests']
+        for path in options['path'] or DEFAULT_PATHS:
+            self.stdout.write(f'{path}, мкс на запрос:')
+            for stack, middleware_paths in (
+                ('прежний стек', LEGACY_MIDDLEWARE),
+                ('текущий стек', settings.MIDDLEWARE),
+            ):
+                layers, status = measure(middleware_paths, path, requests)
+                self.stdout.write(f'  {stack} (ответ {status}):')
+                for name, seconds in layers:
+                    self.stdout.write(f'    {name:<32}{seconds * 1e6:10.1f}')
+                overhead = sum(
+                    seconds for name, seconds in layers
+                    if name != VIEW_LAYER
+                )
+                self.stdout.write(
+                    f'    {"итого middleware":<32}{overhead * 1e6:10.1f}')
@@ -0,0 +1,180 @@
+import gzip
+import zlib
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+# Средний уровень brotli: сжатие близко к максимальному,
+# но на порядок быстрее для ответов, которые формируются на лету.
+BROTLI_QUALITY = 5
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/javascript', 'application/xml', 'text/')
+
+
+def gzip_compress(content):
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def gzip_stream(chunks):
+    # wbits с флагом 16 - формат gzip (заголовок и CRC).
+    compressor = zlib.compressobj(
+        GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def brotli_compress(content):
+    return brotli.compress(content, quality=BROTLI_QUALITY)
+
+
+def brotli_stream(chunks):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+# Кодировки в порядке предпочтения сервера: (сжатие, потоковое сжатие).
+ENCODINGS = {}
+if brotli is not None:
+    ENCODINGS['br'] = (brotli_compress, brotli_stream)
+ENCODINGS['gzip'] = (gzip_compress, gzip_stream)
+
+
+def parse_accept_encoding(header):
+    """Кодировки из Accept-Encoding с их q-значениями."""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    """
+    Кодировка с наибольшим q из поддерживаемых сервером,
+    при равных q - в порядке ENCODINGS; None - без сжатия.
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжимает ответы gzip или brotli (если установлен пакет brotli)
+    по Accept-Encoding клиента.
+    Обычные ответы сжимаются от COMPRESSION_MIN_SIZE байт,
+    потоковые - по частям. Для ответов из кеша ответов
+    (compression_cache_key) сжатые варианты тоже кешируются
+    и повторно не сжимаются.
+    """
+    def process_response(self, request, response):
+        if (response.has_header('Content-Encoding')
+                or not response.get('Content-Type', '').startswith(
+                    COMPRESSIBLE_TYPES)):
+            return response
+        if (not response.streaming
+                and len(response.content) < settings.COMPRESSION_MIN_SIZE):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        compress, compress_stream = ENCODINGS[encoding]
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content)
+            del response['Content-Length']
+        else:
+            response.content = self.get_compressed(
+                response, encoding, compress)
+            response['Content-Length'] = str(len(response.content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # Сжатое представление побайтно отличается от исходного.
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def get_compressed(self, response, encoding, compress):
+        cache_key = getattr(response, 'compression_cache_key', None)
+        if cache_key is None:
+            return compress(response.content)
+        cache_key = f'{cache_key}:{encoding}'
+        content = cache.get(cache_key)
+        if content is None:
+            content = compress(response.content)
+            cache.set(cache_key, content, settings.RESPONSE_CACHE_TIMEOUT)
+        return content
+
+
+def is_api_request(request):
+    return request.path_info.startswith(settings.API_URL_PREFIX)
+
+
+class NonApiMiddlewareMixin:
+    """
+    Пропускает запросы к API_URL_PREFIX мимо middleware:
+    API аутентифицируется по JWT и не использует сессии,
+    CSRF-cookie и сообщения. Остальные страницы (админка)
+    обрабатываются как обычно.
+    """
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class NonApiSessionMiddleware(NonApiMiddlewareMixin, SessionMiddleware):
+    """SessionMiddleware только вне API."""
+
+
+class NonApiCsrfViewMiddleware(NonApiMiddlewareMixin, CsrfViewMiddleware):
+    """CsrfViewMiddleware только вне API."""
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_api_request(request):
+            return None
+        return super().process_view(
+            request, callback, callback_args, callback_kwargs)
+
+
+class NonApiAuthenticationMiddleware(
+    NonApiMiddlewareMixin, AuthenticationMiddleware
+):
+    """AuthenticationMiddleware только вне API."""
+
+
+class NonApiMessageMiddleware(NonApiMiddlewareMixin, MessageMiddleware):
+    """MessageMiddleware только вне API."""
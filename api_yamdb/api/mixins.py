@@ -1,9 +1,344 @@
-from rest_framework import filters, mixins, viewsets
+from collections.abc import Mapping
+from hashlib import md5
+from urllib.parse import urlencode
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.functional import cached_property
+from django.utils.http import http_date, parse_http_date
+from rest_framework import filters, mixins, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import empty
+from rest_framework.response import Response
+
+from reviews.cache import get_catalog_generation
+from reviews.models import Review, Title
 from .permissions import IsAccountAdminOrReadOnly
 
 
+# Заголовки, которые хранятся вместе с закешированным ответом:
+# валидаторы, а также Vary и Allow, которые добавляет DRF.
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Vary', 'Allow')
+
+
+class ConditionalListMixin:
+    """
+    ETag для list.
+    Валидаторы считаются одним агрегирующим запросом по
+    last_modified_field, без сериализации; при совпадении
+    с If-None-Match возвращается 304.
+    Last-Modified для списков не отправляется: удаление строки
+    не сдвигает максимальную отметку времени, и If-Modified-Since
+    вернул бы устаревший ответ. Количество строк и
+    get_validator_tokens() учитываются только в ETag.
+    """
+    last_modified_field = 'updated_at'
+    # Отметки времени связанных объектов по полям ответа
+    # (например, автора) считаются тем же запросом.
+    related_modified_fields = {}
+
+    def get_related_modified_fields(self):
+        sparse_fields = getattr(self, 'sparse_fields', None)
+        return tuple(
+            lookup for name, lookup in self.related_modified_fields.items()
+            if sparse_fields is None or name in sparse_fields
+        )
+
+    def get_validator_timestamps(self):
+        """
+        Дополнительные отметки времени, влияющие на ответ
+        (например, изменения вложенных справочников).
+        """
+        return ()
+
+    def get_validator_tokens(self):
+        """
+        Строки, которые меняются вместе с ответом, но не отражаются
+        в отметках времени (например, удаления связанных объектов).
+        """
+        return ()
+
+    def get_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = (
+            self.last_modified_field, *self.get_related_modified_fields())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                row = queryset.filter(**{
+                    self.lookup_field: self.kwargs[lookup_url_kwarg]
+                }).values_list(*fields).first()
+            except (TypeError, ValueError, DjangoValidationError):
+                # Некорректный id: 404 вернёт обработчик.
+                row = None
+            if row is None:
+                return None, None
+            count = 1
+        else:
+            aggregate = queryset.order_by().aggregate(
+                count=Count('pk'),
+                **{
+                    f'modified_{number}': Max(field)
+                    for number, field in enumerate(fields)
+                },
+            )
+            count = aggregate.pop('count')
+            row = aggregate.values()
+        timestamps = [
+            timestamp
+            for timestamp in (*row, *self.get_validator_timestamps())
+            if timestamp is not None
+        ]
+        tokens = self.get_validator_tokens()
+        raw_etag = '|'.join((
+            request.get_full_path(),
+            str(count),
+            *(timestamp.isoformat() for timestamp in timestamps),
+            *tokens,
+        ))
+        etag = quote_etag(md5(raw_etag.encode()).hexdigest())
+        last_modified = None
+        if self.action == 'retrieve' and timestamps and not tokens:
+            last_modified = int(max(timestamps).timestamp())
+        return etag, last_modified
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, super().list, *args, **kwargs)
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """
+    ETag для list и retrieve; Last-Modified - для retrieve,
+    если ответ полностью описывается отметками времени.
+    """
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, super().retrieve, *args, **kwargs)
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Кеширует готовые ответы на анонимные GET-запросы.
+    Ключ - путь, отсортированные параметры запроса, Accept
+    и поколение каталога, которое меняется при изменении данных.
+    При попадании в кеш ответ отдаётся без аутентификации,
+    запросов к БД и сериализации.
+    """
+    response_cache_timeout = settings.RESPONSE_CACHE_TIMEOUT
+
+    def get_response_cache_key(self, request):
+        if (request.method != 'GET'
+                or 'HTTP_AUTHORIZATION' in request.META):
+            return None
+        query = urlencode(sorted(
+            (key, value)
+            for key, values in request.GET.lists()
+            for value in values
+        ))
+        raw_key = '|'.join((
+            request.path, query, request.META.get('HTTP_ACCEPT', '')))
+        return 'api:response:{}:{}'.format(
+            get_catalog_generation(), md5(raw_key.encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, headers = cached
+                response = get_conditional_response(
+                    request,
+                    etag=headers.get('ETag'),
+                    last_modified=headers.get('Last-Modified-Timestamp'),
+                ) or HttpResponse(content, content_type=content_type)
+                for header in CACHED_HEADERS:
+                    if header in headers:
+                        response[header] = headers[header]
+                response.compression_cache_key = key
+                return response
+        response = super().dispatch(request, *args, **kwargs)
+        if key is not None and response.status_code == 200:
+            response.render()
+            # CompressionMiddleware кеширует сжатые варианты по этому ключу.
+            response.compression_cache_key = key
+            headers = {
+                header: response[header]
+                for header in CACHED_HEADERS if response.has_header(header)
+            }
+            if 'Last-Modified' in headers:
+                headers['Last-Modified-Timestamp'] = parse_http_date(
+                    headers['Last-Modified'])
+            cache.set(
+                key,
+                (response.content, response['Content-Type'], headers),
+                self.response_cache_timeout,
+            )
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    Частичный ответ для GET-запросов: `fields=id,name` оставляет
+    в ответе только указанные поля сериализатора, а queryset
+    загружает из БД только нужные для них столбцы (only()).
+    Столбцы берутся из source полей сериализатора; для вычисляемых
+    полей их задаёт sparse_field_columns. Если столбцы поля
+    неизвестны, загружаются все.
+    """
+    fields_query_param = 'fields'
+    sparse_field_columns = {}
+
+    @cached_property
+    def sparse_fields(self):
+        """Запрошенные поля в порядке сериализатора или None."""
+        raw_fields = self.request.query_params.get(self.fields_query_param)
+        if self.request.method != 'GET' or raw_fields is None:
+            return None
+        requested = {name.strip() for name in raw_fields.split(',')} - {''}
+        available = self.get_serializer_class()().fields
+        unknown = requested - set(available)
+        if not requested or unknown:
+            raise ValidationError({
+                self.fields_query_param: 'Допустимые поля: {}.'.format(
+                    ', '.join(available))
+            })
+        return {
+            name: field for name, field in available.items()
+            if name in requested
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.sparse_fields is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in set(fields) - set(self.sparse_fields):
+                del fields[name]
+        return serializer
+
+    def get_sparse_columns(self, model):
+        """Столбцы для запрошенных полей или None, если их не вывести."""
+        columns = {model._meta.pk.name}
+        for name, field in self.sparse_fields.items():
+            if name in self.sparse_field_columns:
+                columns.update(self.sparse_field_columns[name])
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if model_field.concrete:
+                columns.add(model_field.name)
+            elif not model_field.is_relation:
+                return None
+        return columns
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fields is None:
+            return queryset
+        columns = self.get_sparse_columns(queryset.model)
+        if columns is None:
+            return queryset
+        related = queryset.query.select_related
+        if isinstance(related, dict):
+            # only() не совместим с select_related по отложенному полю.
+            queryset = queryset.select_related(None)
+            kept = [name for name in related if name in columns]
+            if kept:
+                queryset = queryset.select_related(*kept)
+        return queryset.only(*columns)
+
+
+class ValuesListMixin:
+    """
+    list через values_reader (api.readers): строки values()
+    вместо моделей и сериализатора, с учётом `fields=`.
+    """
+    values_reader = None
+
+    def list(self, request, *args, **kwargs):
+        fields = getattr(self, 'sparse_fields', None)
+        queryset = self.values_reader.values(
+            self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                self.values_reader.read(page, fields))
+        return Response(self.values_reader.read(queryset, fields))
+
+
+class BulkCreateDestroyMixin:
+    """
+    Массовые операции.
+    POST со списком объектов создаёт их пачкой (list_serializer_class
+    сериализатора), POST на bulk-delete/ с {"<поле>s": [...]} удаляет
+    объекты по списку значений bulk_delete_field.
+    Размер списка ограничен bulk_max_size.
+    """
+    bulk_delete_field = 'slug'
+    bulk_delete_value_field = serializers.SlugField
+    bulk_max_size = settings.BULK_MAX_SIZE
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        if not 0 < len(request.data) <= self.bulk_max_size:
+            raise ValidationError(
+                f'Список должен содержать от 1 до {self.bulk_max_size} '
+                'объектов.'
+            )
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        key = f'{self.bulk_delete_field}s'
+        field = serializers.ListField(
+            child=self.bulk_delete_value_field(),
+            min_length=1,
+            max_length=self.bulk_max_size,
+        )
+        data = request.data if isinstance(request.data, Mapping) else {}
+        try:
+            values = field.run_validation(data.get(key, empty))
+        except ValidationError as error:
+            raise ValidationError({key: error.detail})
+        queryset = self.get_queryset()
+        _, deleted = queryset.filter(**{
+            f'{self.bulk_delete_field}__in': values
+        }).delete()
+        # Без каскадно удалённых отзывов, комментариев и связей.
+        return Response(
+            {'deleted': deleted.get(queryset.model._meta.label, 0)})
+
+
 class ModelMixinCreateReadDelete(
+    BulkCreateDestroyMixin,
+    AnonymousResponseCacheMixin,
+    ConditionalListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -17,3 +352,27 @@ class ModelMixinCreateReadDelete(
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+
+
+class TitleRelatedMixin:
+    """
+    Произведение из URL, найденное один раз за запрос.
+    Используется view и сериализаторами через context['view'].
+    """
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+
+
+class ReviewRelatedMixin:
+    """
+    Отзыв из URL, найденный один раз за запрос.
+    Отзыв должен относиться к произведению title_id.
+    """
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review,
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
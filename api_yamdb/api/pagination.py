@@ -0,0 +1,51 @@
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+
+from api_yamdb.settings import PAGINATOR_PAGE
+
+CURSOR_MODE = 'cursor'
+
+
+class PubDateCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по (pub_date, id).
+    Не выполняет COUNT(*) и OFFSET по всей выборке:
+    любая страница стоит столько же, сколько первая.
+    """
+    page_size = PAGINATOR_PAGE
+    ordering = ('-pub_date', '-id')
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    """
+    Пагинация по номеру страницы по умолчанию.
+    Курсорный режим включается параметром `pagination=cursor`
+    и сохраняется в ссылках `next`/`previous`.
+    """
+    mode_query_param = 'pagination'
+    page_number_class = PageNumberPagination
+    cursor_class = PubDateCursorPagination
+
+    def _get_paginator(self, request):
+        if (request.query_params.get(self.mode_query_param) == CURSOR_MODE
+                or self.cursor_class.cursor_query_param
+                in request.query_params):
+            return self.cursor_class()
+        return self.page_number_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self._get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(
+            schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
@@ -0,0 +1,139 @@
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+from reviews.cache import category_cache, genre_cache
+from reviews.models import Title
+from .serializers import (CommentSerializer, ReviewSerializer,
+                          TitleReadSerializer)
+
+# Поля, значения которых из values() уже имеют нужный тип.
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.SlugRelatedField,
+)
+
+
+class ValuesReader:
+    """
+    Быстрое представление списков только для чтения.
+    Строки values() превращаются в словари по плану, который один раз
+    строится из полей serializer_class: имя, столбец и преобразование.
+    Модели и поля DRF на каждую строку не создаются,
+    а результат рендерится в те же байты, что и у сериализатора.
+    columns и converters задают столбец и преобразование
+    для полей, которые нельзя вывести из source.
+    """
+    columns = {}
+    converters = {}
+    # Столбцы, нужные не для ответа, а, например, для пагинации.
+    extra_columns = ()
+    # Столбцы, которые заполняет prepare(), а не values().
+    prepared_columns = ()
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def plan(self):
+        plan = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in self.columns:
+                column = self.columns[name]
+            elif isinstance(field, serializers.SlugRelatedField):
+                column = f'{field.source}__{field.slug_field}'
+            else:
+                column = field.source
+            if name in self.converters:
+                converter = self.converters[name]
+            elif isinstance(field, PLAIN_FIELDS):
+                converter = None
+            else:
+                converter = field.to_representation
+            plan.append((name, column, converter))
+        return tuple(plan)
+
+    def get_plan(self, fields=None):
+        if fields is None:
+            return self.plan
+        return tuple(step for step in self.plan if step[0] in fields)
+
+    def values(self, queryset, fields=None):
+        """values() только со столбцами для запрошенных полей."""
+        columns = {
+            column for _, column, _ in self.get_plan(fields)
+            if column not in self.prepared_columns
+        }
+        return queryset.values(*columns.union(self.extra_columns))
+
+    def prepare(self, rows, fields=None):
+        """Догружает в строки данные, которых нет в values()."""
+
+    def read(self, rows, fields=None):
+        rows = list(rows)
+        self.prepare(rows, fields)
+        plan = self.get_plan(fields)
+        result = []
+        for row in rows:
+            item = {}
+            for name, column, converter in plan:
+                value = row[column]
+                if converter is not None and value is not None:
+                    value = converter(value)
+                item[name] = value
+            result.append(item)
+        return result
+
+
+def category_representation(category_id):
+    category = category_cache.get_by_id(category_id)
+    if category is None:
+        return None
+    return {'name': category.name, 'slug': category.slug}
+
+
+def genres_representation(genre_ids):
+    genres = filter(None, map(genre_cache.get_by_id, genre_ids))
+    return [
+        {'name': genre.name, 'slug': genre.slug}
+        for genre in sorted(genres, key=lambda genre: genre.name)
+    ]
+
+
+class TitleValuesReader(ValuesReader):
+    """
+    Произведения: категория и жанры из кеша справочников,
+    id жанров всей страницы - одним запросом.
+    """
+    columns = {'category': 'category_id', 'genre': '_genre_ids'}
+    converters = {
+        'category': category_representation,
+        'genre': genres_representation,
+    }
+    extra_columns = ('id',)
+    prepared_columns = ('_genre_ids',)
+
+    def prepare(self, rows, fields=None):
+        if fields is not None and 'genre' not in fields:
+            return
+        genre_ids = {row['id']: [] for row in rows}
+        links = Title.genre.through.objects.filter(
+            title_id__in=genre_ids
+        ).values_list('title_id', 'genre_id')
+        for title_id, genre_id in links:
+            genre_ids[title_id].append(genre_id)
+        for row in rows:
+            row['_genre_ids'] = genre_ids[row['id']]
+
+
+class PubDateValuesReader(ValuesReader):
+    """Отзывы и комментарии: pub_date и id нужны курсорной пагинации."""
+    extra_columns = ('id', 'pub_date')
+
+
+title_reader = TitleValuesReader(TitleReadSerializer)
+review_reader = PubDateValuesReader(ReviewSerializer)
+comment_reader = PubDateValuesReader(CommentSerializer)
@@ -0,0 +1,29 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+# Даты и время сериализует encoder_class DRF: формат совпадает
+# со стандартным JSONRenderer (миллисекунды, 'Z' для UTC).
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson: тот же компактный UTF-8 без экранирования
+    кириллицы, но в несколько раз быстрее.
+    Для отступов (indent, BrowsableAPI) и настроек UNICODE_JSON=False
+    или COMPACT_JSON=False используется стандартный JSONRenderer.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (self.ensure_ascii or not self.compact or self.get_indent(
+                accepted_media_type, renderer_context or {}) is not None):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        # Как и JSONRenderer, экранируем U+2028 и U+2029 для JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,10 +1,49 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 
+from reviews.bulk import bulk_create_dictionary, bulk_create_titles
+from reviews.cache import category_cache, genre_cache
 from reviews.models import (SCORE_MAX, SCORE_MIN, Category, Comment, Genre,
                             Review, Title)
 
 
+class DictionaryBulkSerializer(serializers.ListSerializer):
+    """
+    Массовое создание записей справочника.
+    Уникальность slug проверяется одним запросом на весь список,
+    а не UniqueValidator для каждой записи.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        slug = self.child.fields['slug']
+        slug.validators = [
+            validator for validator in slug.validators
+            if not isinstance(validator, UniqueValidator)
+        ]
+
+    def validate(self, attrs):
+        counts = Counter(item['slug'] for item in attrs)
+        model = self.child.Meta.model
+        taken = set(model.objects.filter(
+            slug__in=list(counts)
+        ).values_list('slug', flat=True))
+        taken.update(slug for slug, count in counts.items() if count > 1)
+        if taken:
+            raise serializers.ValidationError(
+                'Такие slug уже существуют или повторяются: '
+                + ', '.join(sorted(taken))
+            )
+        return attrs
+
+    def create(self, validated_data):
+        return bulk_create_dictionary(self.child.Meta.model, validated_data)
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """
     Serializer для модели Category.
@@ -14,6 +53,7 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = ('name', 'slug')
         lookup_field = 'slug'
+        list_serializer_class = DictionaryBulkSerializer
 
 
 class GenreSerializer(CategorySerializer):
@@ -26,17 +66,62 @@ class GenreSerializer(CategorySerializer):
         model = Genre
         fields = ('name', 'slug')
         lookup_field = 'slug'
+        list_serializer_class = DictionaryBulkSerializer
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который ищет объекты в кеше справочника,
+    а не в БД.
+    """
+    def __init__(self, dictionary_cache, **kwargs):
+        self.dictionary_cache = dictionary_cache
+        kwargs.setdefault('slug_field', 'slug')
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.dictionary_cache.get_by_slug(data)
+        if obj is None:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=data)
+        return obj
+
+
+def attach_genre_ids(titles):
+    """
+    Одним запросом к промежуточной таблице
+    сохраняет в произведениях id их жанров.
+    """
+    genre_ids = {title.pk: [] for title in titles}
+    links = Title.genre.through.objects.filter(
+        title_id__in=genre_ids
+    ).values_list('title_id', 'genre_id')
+    for title_id, genre_id in links:
+        genre_ids[title_id].append(genre_id)
+    for title in titles:
+        title._genre_ids = genre_ids[title.pk]
+
+
+class TitleListSerializer(serializers.ListSerializer):
+    """
+    Список произведений: жанры всей страницы загружаются одним запросом.
+    """
+    def to_representation(self, data):
+        titles = list(data.all() if hasattr(data, 'all') else data)
+        if 'genre' in self.child.fields:
+            attach_genre_ids(titles)
+        return super().to_representation(titles)
 
 
 class TitleReadSerializer(serializers.ModelSerializer):
     """
     Serializer для модели Title.
+    Категория и жанры берутся из кеша справочников.
     """
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(
-        read_only=True,
-        many=True
-    )
+    category = serializers.SerializerMethodField()
+    genre = serializers.SerializerMethodField()
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -45,19 +130,47 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'id', 'category', 'genre', 'year', 'name', 'description', 'rating')
         model = Title
         read_only_fields = fields
+        list_serializer_class = TitleListSerializer
+
+    def get_category(self, obj):
+        category = category_cache.get_by_id(obj.category_id)
+        if category is None:
+            return None
+        return CategorySerializer(category).data
+
+    def get_genre(self, obj):
+        if not hasattr(obj, '_genre_ids'):
+            attach_genre_ids([obj])
+        genres = filter(None, map(genre_cache.get_by_id, obj._genre_ids))
+        return GenreSerializer(
+            sorted(genres, key=lambda genre: genre.name), many=True
+        ).data
+
+
+class TitleBulkSerializer(serializers.ListSerializer):
+    """
+    Массовое создание произведений: slug категорий и жанров
+    разрешаются через кеш справочников, произведения и их жанры
+    вставляются пачками. Ответ - как у создания одного произведения,
+    жанры для него загружаются одним запросом.
+    """
+    def create(self, validated_data):
+        titles = bulk_create_titles(validated_data)
+        prefetch_related_objects(titles, 'genre')
+        return titles
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
     """
     Serializer для модели Title.
     """
-    category = serializers.SlugRelatedField(
+    category = CachedSlugRelatedField(
+        category_cache,
         queryset=Category.objects.all(),
-        slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
+        genre_cache,
         queryset=Genre.objects.all(),
-        slug_field='slug',
         many=True
     )
 
@@ -65,6 +178,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         """Метаданные."""
         fields = ('id', 'category', 'genre', 'year', 'name', 'description')
         model = Title
+        list_serializer_class = TitleBulkSerializer
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -82,17 +196,25 @@ class ReviewSerializer(serializers.ModelSerializer):
         min_value=SCORE_MIN,
     )
 
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if request.method == 'POST':
-            if Review.objects.filter(title=title, author=author).exists():
-                raise serializers.ValidationError(
+    def create(self, validated_data):
+        # Повторный отзыв отклоняет UniqueConstraint (author, title):
+        # один INSERT без предварительной проверки, корректно
+        # и при одновременных запросах. Другие ошибки целостности
+        # (например, произведение удалено) не выдаются за повтор.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
                     'Вы не можете добавить более одного отзыва на произведение'
-                )
-        return data
+                ]
+            })
 
     class Meta:
         """Метаданные."""
@@ -121,14 +243,3 @@ class CommentSerializer(serializers.ModelSerializer):
             'pub_date',
             'review',
         )
-
-    def create(self, validated_data):
-        comment = Comment.objects.create(
-            review=get_object_or_404(
-                Review,
-                pk=self.context.get('view').kwargs.get('review_id')
-            ),
-            text=validated_data.get('text'),
-            author=self.context['request'].user,
-        )
-        return comment
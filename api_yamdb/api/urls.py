@@ -6,7 +6,7 @@ from api_yamdb.settings import API_VERSION_SLUG
 from .views import (
     CategoryViewSet, CommentViewSet,
     GenresViewSet, TitleViewSet,
-    ReviewViewSet)
+    ReviewViewSet, suggest)
 from users.views import UserViewSet, register, token
 
 api_router = DefaultRouter()
@@ -32,4 +32,5 @@ urlpatterns = [
     path(API_VERSION_SLUG, include(api_router.urls)),
     path(f'{API_VERSION_SLUG}auth/signup/', register, name='register'),
     path(f'{API_VERSION_SLUG}auth/token/', token, name='login'),
+    path(f'{API_VERSION_SLUG}suggest/', suggest, name='suggest'),
 ]
@@ -1,12 +1,32 @@
-from django.shortcuts import get_object_or_404
-from django.db.models import Avg
-from django_filters.rest_framework import DjangoFilterBackend
+from hashlib import md5
+from urllib.parse import urlencode
 
-from rest_framework import filters, viewsets
+from django_filters.rest_framework import DjangoFilterBackend
 
-from reviews.models import Category, Genre, Review, Title
-from .filter import TitleFilter
-from .mixins import ModelMixinCreateReadDelete
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import (action, api_view,
+                                       authentication_classes,
+                                       permission_classes)
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from api_yamdb.settings import (SUGGEST_LIMIT, SUGGEST_MAX_LIMIT,
+                                TRENDING_SIZE)
+from reviews.cache import (category_cache, genre_cache,
+                           get_catalog_generation)
+from reviews.facets import FACETS, title_facets
+from reviews.models import SCORES, Category, Genre, Title, score_count_field
+from reviews.ratings import score_stats
+from reviews.suggest import SUGGEST_KINDS, suggest_index
+from .filter import (TitleFilter, TitleIdsFilter, TitleOrderingFilter,
+                     TitleSearchFilter)
+from .mixins import (AnonymousResponseCacheMixin, BulkCreateDestroyMixin,
+                     ConditionalGetMixin, ModelMixinCreateReadDelete,
+                     ReviewRelatedMixin, SparseFieldsMixin,
+                     TitleRelatedMixin, ValuesListMixin)
+from .pagination import PageNumberOrCursorPagination
+from .readers import comment_reader, review_reader, title_reader
 from .permissions import (IsAccountAdminOrReadOnly,
                           IsAuthorOrAdministratorOrReadOnly)
 from .serializers import (CategorySerializer, CommentSerializer,
@@ -26,49 +46,192 @@ class GenresViewSet(ModelMixinCreateReadDelete):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    BulkCreateDestroyMixin,
+    AnonymousResponseCacheMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet для модели Titles."""
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).all()
+    queryset = Title.objects.all()
     permission_classes = (IsAccountAdminOrReadOnly, )
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    filter_backends = (
+        DjangoFilterBackend,
+        TitleOrderingFilter,
+        TitleSearchFilter,
+        TitleIdsFilter,
+    )
     filterset_class = TitleFilter
+    ordering_fields = ('name', 'year', 'rating', 'review_count')
     ordering = ('name', )
+    facets_query_param = 'facets'
+    bulk_delete_field = 'id'
+    bulk_delete_value_field = serializers.IntegerField
+    sparse_field_columns = {'category': ('category',), 'genre': ()}
+    values_reader = title_reader
+
+    def list(self, request, *args, **kwargs):
+        """
+        Список произведений; с `?facets=genre,category,decade`
+        ответ дополняется количествами по фасетам для тех же фильтров.
+        """
+        names = [
+            name for name in request.query_params.get(
+                self.facets_query_param, '').split(',')
+            if name
+        ]
+        if set(names) - FACETS.keys():
+            return Response(
+                {self.facets_query_param:
+                    f'Допустимые значения: {", ".join(FACETS)}.'},
+                status=status.HTTP_400_BAD_REQUEST)
+        response = super().list(request, *args, **kwargs)
+        if names and response.status_code == status.HTTP_200_OK:
+            response.data['facets'] = title_facets(
+                self.filter_queryset(self.get_queryset()),
+                names,
+                self.get_filter_key(request),
+            )
+        return response
+
+    def get_filter_key(self, request):
+        """Хеш параметров, влияющих на выборку, без пагинации."""
+        params = (
+            *TitleFilter.base_filters,
+            TitleSearchFilter.search_param,
+            TitleIdsFilter.ids_param,
+        )
+        query = urlencode(sorted(
+            (key, value)
+            for key in params
+            for value in request.query_params.getlist(key)
+        ))
+        return md5(query.encode()).hexdigest()
+
+    def get_validator_timestamps(self):
+        return tuple(
+            max(obj.updated_at for obj in dictionary_cache.all())
+            for dictionary_cache in (category_cache, genre_cache)
+            if dictionary_cache.all()
+        )
+
+    def get_validator_tokens(self):
+        # Удаление категории или жанра и изменение жанров произведения
+        # не меняют updated_at, но меняют поколение каталога.
+        return (get_catalog_generation(),)
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'trending', 'similar'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """
+        Самые обсуждаемые произведения по таблице популярности,
+        которую пересчитывает команда refresh_trending.
+        """
+        titles = Title.objects.filter(
+            trending__isnull=False
+        ).order_by('-trending__score')[:TRENDING_SIZE]
+        serializer = self.get_serializer(titles, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Похожие произведения по таблице соседей,
+        которую пересчитывает команда refresh_similar.
+        """
+        title = get_object_or_404(Title, pk=pk)
+        titles = Title.objects.filter(
+            neighbor_of__title=title
+        ).order_by('-neighbor_of__score')
+        serializer = self.get_serializer(titles, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Гистограмма, количество, среднее и медиана оценок
+        по счётчикам произведения.
+        """
+        title = get_object_or_404(Title.objects.only(
+            'rating_sum', 'rating_count',
+            *(score_count_field(score) for score in SCORES)
+        ), pk=pk)
+        return Response(score_stats(title))
+
+
+class ReviewViewSet(
+    TitleRelatedMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
     """POST для всех авторизованных, PATCH для модеров, админов и автора."""
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorOrAdministratorOrReadOnly,)
-
-    @property
-    def _title(self):
-        return get_object_or_404(Title, id=self.kwargs.get("title_id"))
+    pagination_class = PageNumberOrCursorPagination
+    sparse_field_columns = {'author': ('author', 'author__username')}
+    values_reader = review_reader
+    related_modified_fields = {'author': 'author__updated_at'}
 
     def get_queryset(self):
-        return self._title.reviews.all()
+        return self.title.reviews.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(title=self._title, author=self.request.user)
+        serializer.save(title=self.title, author=self.request.user)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReviewRelatedMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet для модели Comment."""
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrAdministratorOrReadOnly,)
-
-    @property
-    def _review(self):
-        return get_object_or_404(Review, id=self.kwargs.get("review_id"))
+    pagination_class = PageNumberOrCursorPagination
+    sparse_field_columns = {'author': ('author', 'author__username')}
+    values_reader = comment_reader
+    related_modified_fields = {'author': 'author__updated_at'}
 
     def get_queryset(self):
-        return self._review.comments.all()
+        return self.review.comments.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self._review)
+        serializer.save(author=self.request.user, review=self.review)
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def suggest(request):
+    """
+    Автодополнение по префиксу слова в названиях произведений,
+    жанров и категорий: `?q=<префикс>&type=title,genre&limit=10`.
+    """
+    try:
+        limit = min(
+            int(request.query_params.get('limit', SUGGEST_LIMIT)),
+            SUGGEST_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {'limit': 'Должно быть целым числом.'},
+            status=status.HTTP_400_BAD_REQUEST)
+    kinds = {
+        kind for kind in request.query_params.get('type', '').split(',')
+        if kind
+    }
+    if kinds - SUGGEST_KINDS.keys():
+        return Response(
+            {'type': f'Допустимые значения: {", ".join(SUGGEST_KINDS)}.'},
+            status=status.HTTP_400_BAD_REQUEST)
+    return Response(suggest_index.suggest(
+        request.query_params.get('q', ''), max(limit, 0), kinds))
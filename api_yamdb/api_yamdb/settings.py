@@ -30,16 +30,21 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
 ]
 
+# Сессии, CSRF, аутентификация Django и сообщения не применяются
+# к запросам под API_URL_PREFIX: API работает по JWT.
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.NonApiSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'api.middleware.NonApiCsrfViewMiddleware',
+    'api.middleware.NonApiAuthenticationMiddleware',
+    'api.middleware.NonApiMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+API_URL_PREFIX = '/api/'
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -71,6 +76,32 @@ DATABASES = {
     }
 }
 
+# Cache
+# Для нескольких процессов укажите общий бэкенд (Redis, Memcached):
+# через него согласуются версии кешей справочников и ответов.
+# Для локального запуска подойдёт и
+# django.core.cache.backends.filebased.FileBasedCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+FACETS_CACHE_TIMEOUT = 60 * 5
+# Версия токенов живёт в кеше недолго: с кешем в памяти процесса
+# понижение роли или блокировка доходят до остальных процессов
+# не позже чем через это время.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+# Справочники в памяти процесса перечитываются не реже этого
+# интервала, даже если изменения из других процессов не видны
+# через кеш (LocMemCache).
+DICTIONARY_CACHE_TIMEOUT = 60
+# Ответы меньше этого размера (в байтах) не сжимаются.
+COMPRESSION_MIN_SIZE = 1024
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -103,6 +134,15 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 PAGINATOR_PAGE = 30
+BULK_MAX_SIZE = 1000
+# Пакетная выборка ?ids= помещается на одну страницу.
+TITLE_IDS_MAX = PAGINATOR_PAGE
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+TRENDING_HALF_LIFE = timedelta(days=7)
+TRENDING_SIZE = 30
+TRENDING_TABLE_SIZE = 1000
+SIMILAR_TOP_K = 10
 
 REGEX_USER = re.compile(r'^[\w.@+-]+\Z')
 REGEX_SLUG = re.compile(r'^[-a-zA-Z0-9_]+$')
@@ -125,7 +165,18 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
+    ],
+
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
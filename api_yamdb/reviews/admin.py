@@ -1,9 +1,12 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Title, Review
+from .models import (Category, Comment, Genre, Review, SimilarTitle, Title,
+                     TrendingTitle)
 
 admin.site.register(Category)
 admin.site.register(Comment)
 admin.site.register(Genre)
 admin.site.register(Title)
 admin.site.register(Review)
+admin.site.register(TrendingTitle)
+admin.site.register(SimilarTitle)
@@ -0,0 +1,87 @@
+from django.db import connections, router, transaction
+
+from .cache import bump_catalog_generation, category_cache, genre_cache
+from .models import Category, Genre, Title
+from .search import index_titles
+from .suggest import suggest_index
+
+DICTIONARY_CACHES = {
+    Category: category_cache,
+    Genre: genre_cache,
+}
+
+
+def _bulk_create(model, objects, unique_field=None):
+    """
+    bulk_create, после которого у всех объектов есть pk.
+    Если бэкенд не возвращает pk из INSERT (SQLite и MySQL в Django 3.2),
+    они перечитываются по unique_field. Без уникального поля pk берутся
+    по порядку id только на SQLite: она держит блокировку записи
+    до конца транзакции, поэтому новые строки - последние.
+    На остальных таких бэкендах объекты сохраняются по одному.
+    Вызывается внутри транзакции.
+    """
+    connection = connections[router.db_for_write(model)]
+    if (unique_field is None
+            and not connection.features.can_return_rows_from_bulk_insert
+            and connection.vendor != 'sqlite'):
+        for obj in objects:
+            obj.save(force_insert=True, using=connection.alias)
+        return objects
+    objects = model.objects.bulk_create(objects)
+    if not objects or objects[0].pk is not None:
+        return objects
+    if unique_field is not None:
+        pks = dict(model.objects.filter(**{
+            f'{unique_field}__in': [
+                getattr(obj, unique_field) for obj in objects]
+        }).values_list(unique_field, 'pk'))
+        for obj in objects:
+            obj.pk = pks[getattr(obj, unique_field)]
+        return objects
+    pks = model.objects.order_by('-pk').values_list(
+        'pk', flat=True)[:len(objects)]
+    for obj, pk in zip(objects, reversed(list(pks))):
+        obj.pk = pk
+    return objects
+
+
+def _catalog_bulk_changed():
+    """Сигналы при bulk_create не отправляются: сбрасываем кеши сами."""
+    bump_catalog_generation()
+    suggest_index.invalidate()
+
+
+def bulk_create_titles(rows):
+    """
+    Создаёт произведения одним bulk_create и связи с жанрами
+    одним INSERT в промежуточную таблицу.
+    rows - проверенные данные сериализатора, genre - список жанров.
+    """
+    through = Title.genre.through
+    with transaction.atomic(using=router.db_for_write(Title)):
+        titles = _bulk_create(Title, [
+            Title(**{
+                field: value for field, value in row.items()
+                if field != 'genre'
+            })
+            for row in rows
+        ])
+        through.objects.bulk_create([
+            through(title_id=title.pk, genre_id=genre_id)
+            for title, row in zip(titles, rows)
+            for genre_id in {genre.pk for genre in row.get('genre', ())}
+        ])
+        index_titles(title.pk for title in titles)
+    _catalog_bulk_changed()
+    return titles
+
+
+def bulk_create_dictionary(model, rows):
+    """Создаёт записи справочника (категории или жанры) одним bulk_create."""
+    with transaction.atomic(using=router.db_for_write(model)):
+        objects = _bulk_create(
+            model, [model(**row) for row in rows], unique_field='slug')
+    DICTIONARY_CACHES[model].invalidate()
+    _catalog_bulk_changed()
+    return objects
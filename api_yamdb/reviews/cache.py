@@ -0,0 +1,143 @@
+from threading import Lock
+from time import monotonic
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category, Genre
+
+# Как часто вне запросов сверять версию справочника с общим кешем, с.
+VERSION_CHECK_INTERVAL = 5
+# Промах по id или slug перечитывает таблицу не чаще раза в интервал, с.
+MISS_RELOAD_INTERVAL = 1
+
+
+def get_shared_version(key):
+    """
+    Версия данных в общем кеше Django.
+    Если её ещё нет, создаётся; при гонке процессов
+    все получают одно значение (cache.add).
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_shared_version(key):
+    """Записывает новую версию данных в общий кеш и возвращает её."""
+    version = uuid4().hex
+    cache.set(key, version, timeout=None)
+    return version
+
+
+class DictionaryCache:
+    """
+    Кеш небольшой таблицы-справочника в памяти процесса.
+    Объекты доступны по id и slug.
+    Актуальность проверяется по версии в общем кеше Django:
+    изменение справочника в любом процессе меняет версию,
+    и остальные процессы перечитывают таблицу.
+    Версия читается один раз за запрос (и не реже раза
+    в VERSION_CHECK_INTERVAL секунд вне запросов), а не при каждом
+    обращении; изменения в своём процессе видны сразу.
+    Если кеш Django не общий для процессов (LocMemCache),
+    таблица всё равно перечитывается не реже раза
+    в DICTIONARY_CACHE_TIMEOUT секунд.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f'reviews:{model._meta.model_name}:version'
+        self._lock = Lock()
+        self._version = None
+        self._checked_at = None
+        self._reloaded_at = None
+        self._objects = ()
+        self._by_id = {}
+        self._by_slug = {}
+
+    def __deepcopy__(self, memo):
+        # Кеш общий для процесса: поля сериализаторов не копируют его.
+        return self
+
+    def _reload(self, version):
+        objects = tuple(self.model.objects.all())
+        with self._lock:
+            self._objects = objects
+            self._by_id = {obj.pk: obj for obj in objects}
+            self._by_slug = {obj.slug: obj for obj in objects}
+            self._version = version
+            self._reloaded_at = monotonic()
+
+    def _refresh(self, force=False):
+        now = monotonic()
+        expired = (
+            self._reloaded_at is None
+            or now - self._reloaded_at >= settings.DICTIONARY_CACHE_TIMEOUT
+        )
+        if (not force and not expired and self._version is not None
+                and self._checked_at is not None
+                and now - self._checked_at < VERSION_CHECK_INTERVAL):
+            return
+        version = get_shared_version(self.version_key)
+        self._checked_at = now
+        if force or expired or version != self._version:
+            self._reload(version)
+
+    def _get(self, index_name, key):
+        self._refresh()
+        obj = getattr(self, index_name).get(key)
+        if obj is None and (
+                monotonic() - self._reloaded_at >= MISS_RELOAD_INTERVAL):
+            # Запись могла появиться в обход сигналов; чтобы неизвестные
+            # slug не перечитывали таблицу каждый раз, не чаще интервала.
+            self._refresh(force=True)
+            obj = getattr(self, index_name).get(key)
+        return obj
+
+    def get_by_id(self, pk):
+        """Объект по id или None."""
+        if pk is None:
+            return None
+        return self._get('_by_id', pk)
+
+    def get_by_slug(self, slug):
+        """Объект по slug или None."""
+        return self._get('_by_slug', slug)
+
+    def all(self):
+        """Все объекты в порядке Meta.ordering модели."""
+        self._refresh()
+        return self._objects
+
+    def start_request(self):
+        """В новом запросе версия снова сверяется с общим кешем."""
+        self._checked_at = None
+
+    def invalidate(self):
+        """Сбрасывает кеш во всех процессах."""
+        bump_shared_version(self.version_key)
+        with self._lock:
+            self._version = None
+
+
+category_cache = DictionaryCache(Category)
+genre_cache = DictionaryCache(Genre)
+
+
+CATALOG_GENERATION_KEY = 'reviews:catalog:generation'
+
+
+def get_catalog_generation():
+    """
+    Поколение каталога: меняется при любом изменении произведений,
+    категорий, жанров и отзывов.
+    """
+    return get_shared_version(CATALOG_GENERATION_KEY)
+
+
+def bump_catalog_generation():
+    """Делает недействительными данные, закешированные для каталога."""
+    bump_shared_version(CATALOG_GENERATION_KEY)
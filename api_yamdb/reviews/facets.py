@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from api_yamdb.settings import FACETS_CACHE_TIMEOUT
+from .cache import category_cache, genre_cache, get_catalog_generation
+from .models import Title
+
+
+def _genre_counts(titles):
+    counts = Title.genre.through.objects.filter(
+        title_id__in=titles
+    ).order_by().values('genre_id').annotate(
+        count=Count('title_id')
+    ).values_list('genre_id', 'count')
+    return _by_slug(genre_cache, counts)
+
+
+def _category_counts(titles):
+    counts = Title.objects.filter(
+        pk__in=titles, category_id__isnull=False
+    ).order_by().values('category_id').annotate(
+        count=Count('pk')
+    ).values_list('category_id', 'count')
+    return _by_slug(category_cache, counts)
+
+
+def _decade_counts(titles):
+    counts = Title.objects.filter(pk__in=titles).order_by().annotate(
+        decade=F('year') / 10 * 10
+    ).values('decade').annotate(count=Count('pk')).values_list(
+        'decade', 'count').order_by('decade')
+    return {str(decade): count for decade, count in counts}
+
+
+def _by_slug(dictionary_cache, counts):
+    """Количества по slug справочника, самые частые первыми."""
+    result = []
+    for pk, count in counts:
+        obj = dictionary_cache.get_by_id(pk)
+        if obj is not None:
+            result.append((obj.slug, count))
+    result.sort(key=lambda item: (-item[1], item[0]))
+    return dict(result)
+
+
+FACETS = {
+    'genre': _genre_counts,
+    'category': _category_counts,
+    'decade': _decade_counts,
+}
+
+
+def title_facets(queryset, names, filter_key):
+    """
+    Количество произведений выборки по жанрам, категориям
+    и десятилетиям: по одному группирующему запросу на фасет.
+    Результат кешируется по фасету и filter_key - строке,
+    однозначно задающей фильтры выборки, до изменения каталога.
+    """
+    generation = get_catalog_generation()
+    keys = {
+        name: f'reviews:facets:{generation}:{name}:{filter_key}'
+        for name in names
+    }
+    cached = cache.get_many(keys.values())
+    titles = queryset.order_by().values('pk')
+    facets, missing = {}, {}
+    for name, key in keys.items():
+        if key in cached:
+            facets[name] = cached[key]
+        else:
+            facets[name] = missing[key] = FACETS[name](titles)
+    if missing:
+        cache.set_many(missing, FACETS_CACHE_TIMEOUT)
+    return facets
@@ -1,30 +1,163 @@
 # pylint: disable=E1101
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from csv import DictReader
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
 
 from django.conf import settings
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.db import connections, transaction
 
+from reviews.cache import (bump_catalog_generation, category_cache,
+                           genre_cache)
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_search_index
+from reviews.suggest import suggest_index
 
-TABLES = {
-    User: 'users.csv',
-    Category: 'category.csv',
-    Genre: 'genre.csv',
-    Title: 'titles.csv',
-    Review: 'review.csv',
-    Comment: 'comments.csv',
-}
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_DATA_DIR = Path(settings.BASE_DIR) / 'static' / 'data'
+
+# Таблицы одного этапа не зависят друг от друга
+# и могут загружаться параллельно (--jobs).
+# Для каждой таблицы: модель, CSV-файл и соответствие
+# колонок CSV с внешними ключами полям модели.
+STAGES = (
+    (
+        (User, 'users.csv', {}),
+        (Category, 'category.csv', {}),
+        (Genre, 'genre.csv', {}),
+    ),
+    (
+        (Title, 'titles.csv', {'category': 'category_id'}),
+    ),
+    (
+        (Title.genre.through, 'genre_title.csv', {}),
+        (Review, 'review.csv', {'author': 'author_id'}),
+    ),
+    (
+        (Comment, 'comments.csv', {'author': 'author_id'}),
+    ),
+)
+
+
+@contextmanager
+def keep_csv_dates(model, columns):
+    """
+    Отключает auto_now_add у полей, значения которых есть в CSV,
+    чтобы сохранить исходные даты публикации.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.name in columns
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 
 class Command(BaseCommand):
-    def handle(self, *args, **kwargs):
-        for model, csv_f in TABLES.items():
-            with open(
-                f'{settings.BASE_DIR}/static/data/{csv_f}',
-                'r',
-                encoding='utf-8'
-            ) as csv_file:
-                reader = DictReader(csv_file)
-                model.objects.bulk_create(
-                    model(**data) for data in reader)
-        self.stdout.write(self.style.SUCCESS('Все данные загружены'))
+    help = 'Загружает данные из CSV-файлов в БД.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном INSERT.',
+        )
+        parser.add_argument(
+            '--data-dir',
+            type=Path,
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help=(
+                'Сколько независимых таблиц загружать одновременно. '
+                'SQLite допускает только одного пишущего, '
+                'для него оставьте 1.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.batch_size = options['batch_size']
+        self.data_dir = options['data_dir']
+        total_rows, started = 0, perf_counter()
+        for stage in STAGES:
+            if options['jobs'] > 1 and len(stage) > 1:
+                with ThreadPoolExecutor(options['jobs']) as executor:
+                    loaded = list(executor.map(
+                        lambda table: self.load_in_thread(*table), stage))
+            else:
+                loaded = [self.load_table(*table) for table in stage]
+            total_rows += sum(loaded)
+        rebuild_ratings()
+        rebuild_search_index()
+        category_cache.invalidate()
+        genre_cache.invalidate()
+        bump_catalog_generation()
+        suggest_index.invalidate()
+        elapsed = perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Все данные загружены: {total_rows} строк за {elapsed:.2f} с '
+            f'({total_rows / elapsed:.0f} строк/с)'
+        ))
+
+    def load_in_thread(self, model, csv_f, fk_columns):
+        try:
+            return self.load_table(model, csv_f, fk_columns)
+        finally:
+            connections.close_all()
+
+    def read_rows(self, reader, fk_columns):
+        """
+        Строки CSV в виде kwargs для модели.
+        Пустые внешние ключи становятся NULL.
+        """
+        for row in reader:
+            for column, attname in fk_columns.items():
+                value = row.pop(column)
+                row[attname] = value or None
+            yield row
+
+    def load_table(self, model, csv_f, fk_columns):
+        """
+        Потоково загружает CSV пачками по batch_size
+        в одной транзакции на таблицу.
+        """
+        path = self.data_dir / csv_f
+        if not path.exists():
+            self.stderr.write(f'{csv_f}: файл не найден, пропущен')
+            return 0
+        rows, started = 0, perf_counter()
+        with open(path, 'r', encoding='utf-8') as csv_file:
+            reader = DictReader(csv_file)
+            objects = (
+                model(**data) for data in self.read_rows(reader, fk_columns))
+            with keep_csv_dates(model, reader.fieldnames or ()), \
+                    transaction.atomic():
+                while True:
+                    batch = list(islice(objects, self.batch_size))
+                    if not batch:
+                        break
+                    model.objects.bulk_create(batch)
+                    rows += len(batch)
+                    self.stdout.write(f'{csv_f}: {rows} строк', ending='\r')
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            f'{csv_f}: {rows} строк за {elapsed:.2f} с '
+            f'({rows / elapsed if elapsed else rows:.0f} строк/с)'
+        )
+        return rows
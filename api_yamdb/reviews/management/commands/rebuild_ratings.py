@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand, CommandError
+
+from reviews.cache import bump_catalog_generation
+from reviews.ratings import find_rating_mismatches, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги произведений по отзывам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить рейтинги, не изменяя их.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            rebuild_ratings()
+            bump_catalog_generation()
+        mismatches = list(
+            find_rating_mismatches().values_list('pk', flat=True))
+        if mismatches:
+            raise CommandError(
+                'Рейтинг расходится с отзывами у произведений: '
+                + ', '.join(map(str, mismatches))
+            )
+        self.stdout.write(self.style.SUCCESS('Рейтинги согласованы'))
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from reviews.cache import bump_catalog_generation
+from reviews.similarity import refresh_similar
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает похожие произведения по оценкам общих '
+        'рецензентов. Запускайте периодически (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать всю матрицу сходства.',
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_similar(full=options['full'])
+        bump_catalog_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f'Похожие произведения пересчитаны: {refreshed}'))
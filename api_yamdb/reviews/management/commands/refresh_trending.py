@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from reviews.cache import bump_catalog_generation
+from reviews.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает популярность произведений по новым отзывам. '
+        'Запускайте периодически (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать популярность по всем отзывам.',
+        )
+
+    def handle(self, *args, **options):
+        processed = refresh_trending(full=options['full'])
+        bump_catalog_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f'Популярность пересчитана, новых отзывов: {processed}'))
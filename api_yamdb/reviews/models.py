@@ -10,6 +10,19 @@ HEADER_LENGTH = 50
 SCORE_MIN = 1
 SCORE_MAX = 10
 CHOICES = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10']
+SCORES = range(SCORE_MIN, SCORE_MAX + 1)
+
+
+def score_count_field(score):
+    """Имя поля Title со счётчиком отзывов с оценкой score."""
+    return f'score_{score}_count'
+
+
+# Агрегаты отзывов в Title: их меняют только UPDATE из reviews.ratings.
+RATING_FIELDS = frozenset((
+    'rating_sum', 'rating_count', 'rating',
+    *(score_count_field(score) for score in SCORES),
+))
 
 
 class Category(models.Model):
@@ -30,6 +43,11 @@ class Category(models.Model):
         help_text='Введите slug-идентификатор',
         validators=(validate_slug,)
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         """Метаданные."""
@@ -59,6 +77,11 @@ class Genre(models.Model):
         help_text='Введите slug-идентификатор',
         validators=(validate_slug,)
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         """Метаданные."""
@@ -79,11 +102,13 @@ class Title(models.Model):
         max_length=MAX_NAME_LENGTH,
         verbose_name='Название',
         help_text='Введите название произведения',
+        db_index=True,
     )
     year = models.IntegerField(
         verbose_name='Год выпуска',
         help_text='Введите год выпуска произведения',
-        validators=(validate_year, )
+        validators=(validate_year, ),
+        db_index=True,
     )
     category = models.ForeignKey(
         Category,
@@ -104,6 +129,81 @@ class Title(models.Model):
         verbose_name='Жанр произведения',
         help_text='Выберите жанр',
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+        db_index=True,
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
+    # Гистограмма оценок: по счётчику на каждую оценку SCORES,
+    # обновляется вместе с рейтингом (reviews.ratings).
+    score_1_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 1',
+        default=0,
+        editable=False,
+    )
+    score_2_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 2',
+        default=0,
+        editable=False,
+    )
+    score_3_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 3',
+        default=0,
+        editable=False,
+    )
+    score_4_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 4',
+        default=0,
+        editable=False,
+    )
+    score_5_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 5',
+        default=0,
+        editable=False,
+    )
+    score_6_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 6',
+        default=0,
+        editable=False,
+    )
+    score_7_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 7',
+        default=0,
+        editable=False,
+    )
+    score_8_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 8',
+        default=0,
+        editable=False,
+    )
+    score_9_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 9',
+        default=0,
+        editable=False,
+    )
+    score_10_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 10',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         """Метаданные."""
@@ -114,6 +214,21 @@ class Title(models.Model):
     def __str__(self):
         return str(self.name)[:HEADER_LENGTH]
 
+    def save(self, *args, **kwargs):
+        """
+        Изменение произведения не записывает агрегаты отзывов
+        (RATING_FIELDS): значения, загруженные вместе с объектом,
+        могли устареть, пока к нему добавлялись отзывы.
+        """
+        if (not self._state.adding and not args
+                and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Review(models.Model):
     """
@@ -144,6 +259,11 @@ class Review(models.Model):
         'Дата публикации отзыва',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения отзыва',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         """Метаданные."""
@@ -155,10 +275,27 @@ class Review(models.Model):
                 name='такой отзыв уже существует'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return str(self.text)[:HEADER_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает оценку и произведение на момент загрузки,
+        чтобы при сохранении пересчитать рейтинг без запроса к БД.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
 
 class Comment(models.Model):
     """
@@ -182,11 +319,133 @@ class Comment(models.Model):
         'Дата публикации комментария',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения комментария',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         """Метаданные."""
         default_related_name = 'comments'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return str(self.text)[:HEADER_LENGTH]
+
+
+class TrendingTitle(models.Model):
+    """
+    Ограниченная таблица самых обсуждаемых произведений.
+    score - сумма вкладов отзывов, затухающих экспоненциально
+    со временем; пересчитывается командой refresh_trending.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Произведение',
+    )
+    score = models.FloatField(
+        verbose_name='Популярность',
+        db_index=True,
+    )
+
+    class Meta:
+        """Метаданные."""
+        ordering = ('-score',)
+        verbose_name_plural = 'Популярные произведения'
+        verbose_name = 'Популярное произведение'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score:.3f}'
+
+
+class TrendingState(models.Model):
+    """
+    Состояние пересчёта популярности: последний учтённый отзыв
+    и момент, к которому приведены значения score.
+    """
+    last_review_id = models.PositiveBigIntegerField(
+        verbose_name='Последний учтённый отзыв',
+        default=0,
+    )
+    refreshed_at = models.DateTimeField(
+        verbose_name='Время пересчёта',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        """Метаданные."""
+        verbose_name = 'Состояние популярности'
+        verbose_name_plural = 'Состояние популярности'
+
+    def __str__(self):
+        return f'{self.last_review_id} @ {self.refreshed_at}'
+
+
+class SimilarTitle(models.Model):
+    """
+    Ближайшие соседи произведения по оценкам общих рецензентов
+    (косинусная мера). Хранится не более SIMILAR_TOP_K соседей,
+    таблицу пересчитывает команда refresh_similar.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='neighbors',
+        verbose_name='Произведение',
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='neighbor_of',
+        verbose_name='Похожее произведение',
+    )
+    score = models.FloatField(verbose_name='Сходство')
+
+    class Meta:
+        """Метаданные."""
+        ordering = ('title', '-score')
+        verbose_name_plural = 'Похожие произведения'
+        verbose_name = 'Похожее произведение'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'similar'),
+                name='unique_similar_title'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('title', '-score'),
+                name='similar_title_score_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id} ~ {self.similar_id}: {self.score:.3f}'
+
+
+class SimilarityState(models.Model):
+    """Момент последнего пересчёта похожих произведений."""
+    refreshed_at = models.DateTimeField(
+        verbose_name='Время пересчёта',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        """Метаданные."""
+        verbose_name = 'Состояние похожих произведений'
+        verbose_name_plural = 'Состояние похожих произведений'
+
+    def __str__(self):
+        return str(self.refreshed_at)
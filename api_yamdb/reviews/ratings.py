@@ -0,0 +1,134 @@
+from django.db.models import (Case, Count, F, IntegerField, OuterRef, Q,
+                              Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce, Now
+
+from .models import SCORES, Review, Title, score_count_field
+
+
+def _rating_expression(score_delta=0, count_delta=0):
+    """
+    Выражение для рейтинга с учётом изменения суммы и количества оценок.
+    Значения F() в UPDATE берутся до изменения строки.
+    """
+    return Case(
+        When(rating_count=-count_delta, then=Value(None)),
+        default=(
+            (F('rating_sum') + score_delta)
+            / (F('rating_count') + count_delta)
+        ),
+        output_field=IntegerField(),
+    )
+
+
+def apply_rating_delta(title_id, added_score=None, removed_score=None):
+    """
+    Атомарно учитывает добавленную и (или) убранную оценку:
+    сумму, количество, рейтинг и гистограмму оценок произведения
+    изменяет один UPDATE, без чтения строки.
+    """
+    if added_score == removed_score:
+        return
+    score_delta = (added_score or 0) - (removed_score or 0)
+    count_delta = (added_score is not None) - (removed_score is not None)
+    counters = {}
+    if added_score is not None:
+        field = score_count_field(added_score)
+        counters[field] = F(field) + 1
+    if removed_score is not None:
+        field = score_count_field(removed_score)
+        counters[field] = F(field) - 1
+    Title.objects.filter(pk=title_id).update(
+        rating=_rating_expression(score_delta, count_delta),
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        updated_at=Now(),
+        **counters,
+    )
+
+
+def rebuild_ratings(queryset=None):
+    """
+    Пересчитывает рейтинги и гистограммы оценок произведений
+    по таблице отзывов.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    queryset.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0,
+        ),
+        **{
+            score_count_field(score): Coalesce(
+                Subquery(reviews.filter(score=score).annotate(
+                    total=Count('pk')).values('total')),
+                0,
+            )
+            for score in SCORES
+        },
+    )
+    queryset.update(rating=_rating_expression(), updated_at=Now())
+
+
+def find_rating_mismatches(queryset=None):
+    """
+    Возвращает произведения, сохранённый рейтинг или гистограмма
+    оценок которых расходятся с отзывами.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    mismatch = (
+        ~Q(rating_sum=F('actual_sum')) | ~Q(rating_count=F('actual_count'))
+        | Q(rating_count=0, rating__isnull=False)
+        | Q(rating_count__gt=0) & ~Q(rating=F('expected_rating'))
+    )
+    for score in SCORES:
+        mismatch |= ~Q(**{score_count_field(score): F(f'actual_{score}')})
+    return queryset.annotate(
+        expected_rating=_rating_expression(),
+        actual_sum=Coalesce(Sum('reviews__score'), 0),
+        actual_count=Count('reviews'),
+        **{
+            f'actual_{score}': Count(
+                'reviews', filter=Q(reviews__score=score))
+            for score in SCORES
+        },
+    ).filter(mismatch)
+
+
+def score_stats(title):
+    """
+    Гистограмма, количество, среднее и медиана оценок произведения
+    по счётчикам, без обращения к отзывам.
+    """
+    histogram = {
+        str(score): getattr(title, score_count_field(score))
+        for score in SCORES
+    }
+    count = title.rating_count
+    if not count:
+        return {
+            'count': 0, 'mean': None, 'median': None, 'histogram': histogram}
+    # Позиции средних элементов в упорядоченном списке оценок:
+    # одна при нечётном количестве, две при чётном.
+    middle = {(count - 1) // 2, count // 2}
+    median, seen = [], 0
+    for score in SCORES:
+        median.extend(
+            score for position in middle
+            if seen <= position < seen + histogram[str(score)]
+        )
+        seen += histogram[str(score)]
+    return {
+        'count': count,
+        'mean': round(title.rating_sum / count, 2),
+        'median': sum(median) / len(median),
+        'histogram': histogram,
+    }
@@ -0,0 +1,180 @@
+import re
+
+from django.db import DatabaseError, connections, router
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Title
+
+SQLITE_SEARCH_TABLE = 'reviews_title_fts'
+POSTGRES_SEARCH_INDEX = 'reviews_title_search_gin'
+POSTGRES_SEARCH_CONFIG = 'russian'
+POSTGRES_DOCUMENT = (
+    "to_tsvector('{config}', coalesce({table}name, '') || ' ' "
+    "|| coalesce({table}description, ''))"
+)
+SEARCH_WORD = re.compile(r'\w+')
+# Не больше параметров в запросе, чем допускают старые версии SQLite.
+SQLITE_BATCH_SIZE = 900
+
+_sqlite_index_available = {}
+
+
+def _connection():
+    return connections[router.db_for_write(Title)]
+
+
+def _sqlite_index_exists(connection):
+    if connection.alias not in _sqlite_index_available:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = %s",
+                (SQLITE_SEARCH_TABLE,),
+            )
+            _sqlite_index_available[connection.alias] = (
+                cursor.fetchone() is not None)
+    return _sqlite_index_available[connection.alias]
+
+
+def create_search_index(using):
+    """
+    Создаёт полнотекстовый индекс произведений:
+    виртуальную таблицу FTS5 в SQLite или GIN-индекс в PostgreSQL.
+    """
+    connection = connections[using]
+    _sqlite_index_available.pop(using, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS '
+                    f'{SQLITE_SEARCH_TABLE} USING fts5('
+                    f"name, description, tokenize='unicode61')"
+                )
+            except DatabaseError:
+                # SQLite собран без FTS5: поиск работает через LIKE.
+                return
+        elif connection.vendor == 'postgresql':
+            document = POSTGRES_DOCUMENT.format(
+                config=POSTGRES_SEARCH_CONFIG, table='')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {POSTGRES_SEARCH_INDEX} '
+                f'ON {Title._meta.db_table} USING gin ({document})'
+            )
+
+
+def index_title(title):
+    """Добавляет или обновляет произведение в индексе SQLite."""
+    connection = _connection()
+    if connection.vendor != 'sqlite' or not _sqlite_index_exists(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s',
+            (title.pk,))
+        cursor.execute(
+            f'INSERT INTO {SQLITE_SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            (title.pk, title.name, title.description or ''),
+        )
+
+
+def index_titles(title_ids):
+    """
+    Добавляет в индекс SQLite произведения,
+    созданные без сигналов (bulk_create).
+    """
+    connection = _connection()
+    if connection.vendor != 'sqlite' or not _sqlite_index_exists(connection):
+        return
+    title_ids = list(title_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(title_ids), SQLITE_BATCH_SIZE):
+            batch = title_ids[start:start + SQLITE_BATCH_SIZE]
+            cursor.execute(
+                f'INSERT INTO {SQLITE_SEARCH_TABLE} '
+                f'(rowid, name, description) '
+                f"SELECT id, name, coalesce(description, '') "
+                f'FROM {Title._meta.db_table} '
+                f'WHERE id IN ({", ".join(["%s"] * len(batch))})',
+                batch,
+            )
+
+
+def unindex_title(title_id):
+    """Удаляет произведение из индекса SQLite."""
+    connection = _connection()
+    if connection.vendor != 'sqlite' or not _sqlite_index_exists(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s',
+            (title_id,))
+
+
+def rebuild_search_index():
+    """Перестраивает индекс SQLite по таблице произведений."""
+    connection = _connection()
+    if connection.vendor != 'sqlite' or not _sqlite_index_exists(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SQLITE_SEARCH_TABLE} (rowid, name, description) '
+            f"SELECT id, name, coalesce(description, '') "
+            f'FROM {Title._meta.db_table}'
+        )
+
+
+def search_titles(queryset, query):
+    """
+    Оставляет произведения, в названии или описании которых есть
+    все слова запроса (по префиксу в SQLite), и добавляет аннотацию
+    search_rank: чем меньше, тем релевантнее.
+    """
+    words = SEARCH_WORD.findall(query)
+    if not words:
+        return queryset
+    connection = _connection()
+    table = f'"{Title._meta.db_table}".'
+    if connection.vendor == 'postgresql':
+        document = POSTGRES_DOCUMENT.format(
+            config=POSTGRES_SEARCH_CONFIG, table=table)
+        ts_query = f"plainto_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)"
+        search_query = ' '.join(words)
+        # Выражение совпадает с GIN-индексом из create_search_index.
+        return queryset.annotate(
+            search_match=RawSQL(
+                f'{document} @@ {ts_query}',
+                (search_query,),
+                output_field=BooleanField(),
+            ),
+            search_rank=RawSQL(
+                f'-ts_rank({document}, {ts_query})',
+                (search_query,),
+                output_field=FloatField(),
+            ),
+        ).filter(search_match=True)
+    if connection.vendor == 'sqlite' and _sqlite_index_exists(connection):
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} '
+                f'WHERE {SQLITE_SEARCH_TABLE} MATCH %s',
+                (match,),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT rank FROM {SQLITE_SEARCH_TABLE} '
+                f'WHERE {SQLITE_SEARCH_TABLE} MATCH %s '
+                f'AND rowid = {table}"id"',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+    condition = Q()
+    for word in words:
+        condition &= Q(name__icontains=word) | Q(description__icontains=word)
+    return queryset.filter(condition).annotate(
+        search_rank=RawSQL('0', (), output_field=FloatField()))
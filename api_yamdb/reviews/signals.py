@@ -0,0 +1,114 @@
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_generation, category_cache, genre_cache
+from .models import Category, Genre, Review, Title
+from .ratings import apply_rating_delta, rebuild_ratings
+from .search import create_search_index, index_title, unindex_title
+from .suggest import suggest_index
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """
+    Обновляет рейтинг и гистограмму оценок произведения
+    после сохранения отзыва.
+    """
+    loaded_score = getattr(instance, '_loaded_score', None)
+    loaded_title_id = getattr(instance, '_loaded_title_id', None)
+    if created:
+        apply_rating_delta(instance.title_id, added_score=instance.score)
+    elif loaded_score is None:
+        # Отзыв сохранён без загрузки из БД: прежняя оценка неизвестна.
+        rebuild_ratings(Title.objects.filter(pk=instance.title_id))
+    elif loaded_title_id != instance.title_id:
+        apply_rating_delta(loaded_title_id, removed_score=loaded_score)
+        apply_rating_delta(instance.title_id, added_score=instance.score)
+    else:
+        apply_rating_delta(
+            instance.title_id, instance.score, loaded_score)
+    instance._loaded_score = instance.score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """
+    Обновляет рейтинг произведения после удаления отзыва,
+    в том числе каскадного (при удалении пользователя или произведения).
+    """
+    apply_rating_delta(instance.title_id, removed_score=instance.score)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, using=None, **kwargs):
+    """Сбрасывает кеш категорий после фиксации транзакции."""
+    transaction.on_commit(category_cache.invalidate, using=using)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, using=None, **kwargs):
+    """Сбрасывает кеш жанров после фиксации транзакции."""
+    transaction.on_commit(genre_cache.invalidate, using=using)
+
+
+@receiver(request_started)
+def dictionaries_request_started(sender, **kwargs):
+    """Версии справочников сверяются один раз за запрос."""
+    category_cache.start_request()
+    genre_cache.start_request()
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(m2m_changed, sender=Title.genre.through)
+def catalog_changed(sender, using=None, **kwargs):
+    """
+    Сбрасывает закешированные ответы каталога после фиксации
+    транзакции: иначе параллельный запрос мог бы прочитать прежние
+    данные и закешировать их под новым поколением.
+    """
+    transaction.on_commit(bump_catalog_generation, using=using)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    """Обновляет произведение в полнотекстовом индексе."""
+    index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    """Удаляет произведение из полнотекстового индекса."""
+    unindex_title(instance.pk)
+
+
+def search_index_migrate(sender, using, **kwargs):
+    """Создаёт полнотекстовый индекс после миграций."""
+    create_search_index(using)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def suggest_object_saved(sender, instance, **kwargs):
+    """Обновляет объект в индексе автодополнения."""
+    suggest_index.update(sender._meta.model_name, instance)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def suggest_object_deleted(sender, instance, **kwargs):
+    """Удаляет объект из индекса автодополнения."""
+    suggest_index.remove(sender._meta.model_name, instance.pk)
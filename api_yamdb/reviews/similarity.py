@@ -0,0 +1,158 @@
+"""
+Похожие произведения: косинусная мера между столбцами разреженной
+матрицы оценок (рецензенты x произведения).
+Требует numpy и scipy; используется только командой refresh_similar.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from scipy import sparse
+
+from api_yamdb.settings import SIMILAR_TOP_K
+from .models import Review, SimilarityState, SimilarTitle
+
+
+def _score_matrix(reviews):
+    """
+    Разреженная матрица оценок по тройкам (автор, произведение, оценка).
+    Возвращает матрицу и id произведений, соответствующие столбцам.
+    """
+    triples = np.array(
+        list(reviews.order_by().values_list('author_id', 'title_id', 'score')),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    author_ids, rows = np.unique(triples[:, 0], return_inverse=True)
+    title_ids, columns = np.unique(triples[:, 1], return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (triples[:, 2].astype(np.float64), (rows, columns)),
+        shape=(len(author_ids), len(title_ids)),
+    )
+    return matrix, title_ids
+
+
+def _title_norms(title_ids):
+    """Евклидовы нормы столбцов по всем отзывам: один запрос с GROUP BY."""
+    squares = dict(
+        Review.objects.filter(title_id__in=title_ids.tolist())
+        .order_by().values('title_id')
+        .annotate(total=Sum(F('score') * F('score')))
+        .values_list('title_id', 'total')
+    )
+    return np.sqrt(np.array(
+        [squares.get(title_id, 0) for title_id in title_ids.tolist()],
+        dtype=np.float64,
+    ))
+
+
+def _neighbors(row_title_ids, similarity, title_ids, limit):
+    """
+    Для каждой строки разреженной матрицы сходства - соседи
+    с положительным сходством, не более limit лучших (None - все).
+    """
+    similarity = similarity.tocsr()
+    neighbors = {}
+    for position, title_id in enumerate(row_title_ids.tolist()):
+        start, end = similarity.indptr[position:position + 2]
+        columns = similarity.indices[start:end]
+        values = similarity.data[start:end]
+        keep = (title_ids[columns] != title_id) & (values > 0)
+        columns, values = columns[keep], values[keep]
+        if limit is not None and len(values) > limit:
+            best = np.argpartition(-values, limit)[:limit]
+            columns, values = columns[best], values[best]
+        neighbors[title_id] = dict(zip(
+            title_ids[columns].tolist(), values.tolist()))
+    return neighbors
+
+
+def _cosine_rows(matrix, title_ids, norms, row_positions,
+                 limit=SIMILAR_TOP_K):
+    """Строки матрицы косинусного сходства для указанных столбцов."""
+    dot = (matrix[:, row_positions].T @ matrix).tocoo()
+    denominator = norms[row_positions][dot.row] * norms[dot.col]
+    dot.data = np.divide(
+        dot.data, denominator,
+        out=np.zeros_like(dot.data), where=denominator > 0)
+    return _neighbors(title_ids[row_positions], dot, title_ids, limit)
+
+
+def _top_k(similar):
+    return dict(sorted(
+        similar.items(), key=lambda item: -item[1])[:SIMILAR_TOP_K])
+
+
+def _save_neighbors(neighbors):
+    SimilarTitle.objects.filter(title_id__in=list(neighbors)).delete()
+    SimilarTitle.objects.bulk_create(
+        SimilarTitle(title_id=title_id, similar_id=similar_id, score=score)
+        for title_id, similar in neighbors.items()
+        for similar_id, score in similar.items()
+    )
+
+
+def _merge_into_neighbors(changed):
+    """
+    Добавляет все пересчитанные пары (a, j) в списки соседей j,
+    которые сами не пересчитывались, сохраняя top-k.
+    """
+    updates = {}
+    for title_id, similar in changed.items():
+        for similar_id, score in similar.items():
+            if similar_id not in changed:
+                updates.setdefault(similar_id, {})[title_id] = score
+    if not updates:
+        return
+    current = {title_id: {} for title_id in updates}
+    for title_id, similar_id, score in SimilarTitle.objects.filter(
+            title_id__in=list(updates)
+    ).values_list('title_id', 'similar_id', 'score'):
+        current[title_id][similar_id] = score
+    for title_id, scores in updates.items():
+        current[title_id] = _top_k({**current[title_id], **scores})
+    _save_neighbors(current)
+
+
+@transaction.atomic
+def refresh_similar(full=False):
+    """
+    Пересчитывает соседей произведений.
+    Полный пересчёт строит всю матрицу сходства; инкрементальный -
+    только строки произведений с отзывами, изменёнными после
+    прошлого запуска, и обновляет их в списках соседей.
+    Удалённые отзывы учитываются только полным пересчётом.
+    Возвращает число пересчитанных произведений.
+    """
+    started = timezone.now()
+    state, _ = SimilarityState.objects.select_for_update().get_or_create(
+        pk=1)
+    if full or state.refreshed_at is None:
+        matrix, title_ids = _score_matrix(Review.objects.all())
+        norms = np.sqrt(
+            np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        neighbors = _cosine_rows(
+            matrix, title_ids, norms, np.arange(len(title_ids)))
+        SimilarTitle.objects.all().delete()
+        _save_neighbors(neighbors)
+    else:
+        changed_titles = Review.objects.filter(
+            updated_at__gte=state.refreshed_at
+        ).values('title_id')
+        # Все отзывы авторов, писавших о изменённых произведениях:
+        # этого достаточно для точного пересчёта их строк.
+        matrix, title_ids = _score_matrix(Review.objects.filter(
+            author_id__in=Review.objects.filter(
+                title_id__in=changed_titles).values('author_id')
+        ))
+        changed = set(changed_titles.values_list('title_id', flat=True))
+        row_positions = np.flatnonzero(np.isin(title_ids, list(changed)))
+        rows = _cosine_rows(
+            matrix, title_ids, _title_norms(title_ids), row_positions,
+            limit=None)
+        neighbors = {
+            title_id: _top_k(similar) for title_id, similar in rows.items()}
+        _save_neighbors(neighbors)
+        _merge_into_neighbors(rows)
+    state.refreshed_at = started
+    state.save()
+    return len(neighbors)
@@ -0,0 +1,135 @@
+import re
+from bisect import bisect_left, insort
+from threading import Lock
+
+from .cache import bump_shared_version, get_shared_version
+from .models import Category, Genre, Title
+
+WORD = re.compile(r'\w+')
+SUGGEST_KINDS = {
+    'title': (Title, 'id'),
+    'genre': (Genre, 'slug'),
+    'category': (Category, 'slug'),
+}
+
+
+def normalize(text):
+    """Нижний регистр, ё -> е, только слова через пробел."""
+    return ' '.join(WORD.findall(text.casefold().replace('ё', 'е')))
+
+
+class PrefixIndex:
+    """
+    Отсортированный в памяти процесса индекс названий произведений,
+    жанров и категорий для автодополнения.
+    Каждое название попадает в индекс с начала каждого слова,
+    поиск по префиксу - двоичный поиск по списку.
+    Изменения применяются к индексу точечно по сигналам;
+    другие процессы узнают о них по версии в общем кеше
+    и перестраивают индекс целиком.
+    """
+    version_key = 'reviews:suggest:version'
+
+    def __init__(self):
+        self._lock = Lock()
+        self._version = None
+        self._entries = []
+        self._objects = {}
+
+    @staticmethod
+    def _make_entries(kind, pk, name, identifier):
+        words = normalize(name).split()
+        return sorted({
+            (' '.join(words[position:]), kind, pk, identifier, name)
+            for position in range(len(words))
+        })
+
+    def _rebuild(self, version):
+        entries, objects = [], {}
+        for kind, (model, identifier_field) in SUGGEST_KINDS.items():
+            for pk, name, identifier in model.objects.values_list(
+                    'pk', 'name', identifier_field).order_by():
+                object_entries = self._make_entries(
+                    kind, pk, name, identifier)
+                objects[kind, pk] = object_entries
+                entries.extend(object_entries)
+        entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._objects = objects
+            self._version = version
+
+    def _refresh(self):
+        version = get_shared_version(self.version_key)
+        if version != self._version:
+            self._rebuild(version)
+
+    def _remove_locked(self, kind, pk):
+        for entry in self._objects.pop((kind, pk), ()):
+            position = bisect_left(self._entries, entry)
+            if (position < len(self._entries)
+                    and self._entries[position] == entry):
+                del self._entries[position]
+
+    def update(self, kind, obj):
+        """Добавляет или обновляет объект в индексе."""
+        identifier_field = SUGGEST_KINDS[kind][1]
+        entries = self._make_entries(
+            kind, obj.pk, obj.name, getattr(obj, identifier_field))
+        self._apply(kind, obj.pk, entries)
+
+    def remove(self, kind, pk):
+        """Удаляет объект из индекса."""
+        self._apply(kind, pk, ())
+
+    def _apply(self, kind, pk, entries):
+        up_to_date = self._version == get_shared_version(self.version_key)
+        version = bump_shared_version(self.version_key)
+        with self._lock:
+            if not up_to_date:
+                # Индекс и так будет перестроен при следующем поиске.
+                self._version = None
+                return
+            self._remove_locked(kind, pk)
+            for entry in entries:
+                insort(self._entries, entry)
+            if entries:
+                self._objects[kind, pk] = entries
+            self._version = version
+
+    def invalidate(self):
+        """Перестроить индекс во всех процессах."""
+        bump_shared_version(self.version_key)
+        with self._lock:
+            self._version = None
+
+    def suggest(self, prefix, limit, kinds=None):
+        """
+        До limit объектов, в названии которых есть слово,
+        начинающееся с prefix. Каждый объект возвращается один раз.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        self._refresh()
+        with self._lock:
+            entries = self._entries
+            position = bisect_left(entries, (prefix,))
+            found, seen = [], set()
+            while position < len(entries) and len(found) < limit:
+                key, kind, pk, identifier, name = entries[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if (kinds and kind not in kinds) or (kind, pk) in seen:
+                    continue
+                seen.add((kind, pk))
+                found.append({
+                    'type': kind,
+                    SUGGEST_KINDS[kind][1]: identifier,
+                    'name': name,
+                })
+        return found
+
+
+suggest_index = PrefixIndex()
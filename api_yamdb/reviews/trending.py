@@ -0,0 +1,67 @@
+from collections import defaultdict
+from math import exp, log
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api_yamdb.settings import TRENDING_HALF_LIFE, TRENDING_TABLE_SIZE
+from .models import Review, TrendingState, TrendingTitle
+
+DECAY_RATE = log(2) / TRENDING_HALF_LIFE.total_seconds()
+# Вклад, ниже которого произведение убирается из таблицы
+# (отзыв, которому больше 20 периодов полураспада).
+MIN_SCORE = 2 ** -20
+
+
+def decay(seconds):
+    """Множитель затухания за указанное число секунд."""
+    return exp(-DECAY_RATE * max(seconds, 0))
+
+
+@transaction.atomic
+def refresh_trending(now=None, full=False):
+    """
+    Приводит значения популярности к моменту now и добавляет вклад
+    отзывов, появившихся с прошлого пересчёта (id больше
+    последнего учтённого). Таблица обрезается до TRENDING_TABLE_SIZE.
+    Возвращает число учтённых отзывов.
+    """
+    now = now or timezone.now()
+    state, _ = TrendingState.objects.select_for_update().get_or_create(pk=1)
+    if full:
+        TrendingTitle.objects.all().delete()
+        state.last_review_id, state.refreshed_at = 0, None
+    if state.refreshed_at is not None:
+        TrendingTitle.objects.update(score=F('score') * decay(
+            (now - state.refreshed_at).total_seconds()))
+
+    contributions = defaultdict(float)
+    last_review_id, processed = state.last_review_id, 0
+    new_reviews = Review.objects.filter(
+        pk__gt=state.last_review_id
+    ).order_by().values_list('pk', 'title_id', 'pub_date')
+    for review_id, title_id, pub_date in new_reviews.iterator():
+        contributions[title_id] += decay((now - pub_date).total_seconds())
+        last_review_id = max(last_review_id, review_id)
+        processed += 1
+
+    existing = TrendingTitle.objects.in_bulk(list(contributions))
+    for trending in existing.values():
+        trending.score += contributions[trending.pk]
+    TrendingTitle.objects.bulk_update(existing.values(), ('score',))
+    TrendingTitle.objects.bulk_create(
+        TrendingTitle(title_id=title_id, score=score)
+        for title_id, score in contributions.items()
+        if title_id not in existing and score >= MIN_SCORE
+    )
+
+    TrendingTitle.objects.filter(score__lt=MIN_SCORE).delete()
+    overflow = list(TrendingTitle.objects.order_by(
+        '-score').values_list('pk', flat=True)[TRENDING_TABLE_SIZE:])
+    if overflow:
+        TrendingTitle.objects.filter(pk__in=overflow).delete()
+
+    state.last_review_id, state.refreshed_at = last_review_id, now
+    state.save()
+    return processed
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import TokenUser, User
+
+USERNAME_CLAIM = 'username'
+ROLE_CLAIM = 'role'
+TOKEN_VERSION_CLAIM = 'ver'
+TOKEN_VERSION_CACHE_KEY = 'users:token_version:{}'
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя.
+    Берётся из кеша, при промахе - из БД;
+    в кеше хранится TOKEN_VERSION_CACHE_TIMEOUT секунд.
+    None, если пользователя нет.
+    """
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is not None:
+            cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def set_token_version(user):
+    """Публикует версию токенов пользователя в кеше."""
+    if not user.is_active:
+        drop_token_version(user.pk)
+        return
+    cache.set(
+        TOKEN_VERSION_CACHE_KEY.format(user.pk),
+        user.token_version,
+        settings.TOKEN_VERSION_CACHE_TIMEOUT,
+    )
+
+
+def drop_token_version(user_id):
+    """Удаляет версию токенов пользователя из кеша."""
+    cache.delete(TOKEN_VERSION_CACHE_KEY.format(user_id))
+
+
+class RoleAccessToken(AccessToken):
+    """
+    Access-токен с username, ролью и версией токенов пользователя.
+    """
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[USERNAME_CLAIM] = user.username
+        token[ROLE_CLAIM] = user.role
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без загрузки пользователя из БД.
+    Пользователь собирается из claims токена; смена роли или блокировка
+    увеличивает версию токенов, и старые токены отклоняются.
+    Токены без claims роли обрабатываются как раньше, через БД.
+    """
+    def get_user(self, validated_token):
+        if not all(
+            claim in validated_token
+            for claim in (USERNAME_CLAIM, ROLE_CLAIM, TOKEN_VERSION_CLAIM)
+        ):
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        if get_token_version(user_id) != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                _('Token has been revoked'), code='token_revoked')
+        return TokenUser(
+            pk=user_id,
+            username=validated_token[USERNAME_CLAIM],
+            role=validated_token[ROLE_CLAIM],
+        )
@@ -48,6 +48,16 @@ class User(AbstractUser):
         choices=UserRole.choices,
         default=UserRole.USER
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
+    token_version = models.PositiveIntegerField(
+        verbose_name='Версия токенов',
+        default=0,
+        editable=False,
+    )
     objects = UserManagerSuperuserIsAdmin()
 
     class Meta:
@@ -58,6 +68,32 @@ class User(AbstractUser):
     def __str__(self):
         return str(self.username)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает роль и активность на момент загрузки.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_access = (
+            instance.__dict__.get('role'),
+            instance.__dict__.get('is_active'),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        При смене роли или блокировке увеличивает версию токенов:
+        выданные ранее токены перестают приниматься.
+        """
+        loaded_access = getattr(self, '_loaded_access', None)
+        if loaded_access and loaded_access != (self.role, self.is_active):
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_access = (self.role, self.is_active)
+
     @property
     def is_admin(self):
         """
@@ -73,3 +109,20 @@ class User(AbstractUser):
         Возвращает права модератора.
         """
         return self.role == UserRole.MODERATOR
+
+
+class TokenUser(User):
+    """
+    Пользователь, восстановленный из claims JWT-токена без запроса к БД.
+    Содержит только id, username и роль; сохранять его нельзя.
+    """
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise NotImplementedError(
+            'TokenUser нельзя сохранить: загрузите User из БД.')
+
+    def delete(self, *args, **kwargs):
+        raise NotImplementedError(
+            'TokenUser нельзя удалить: загрузите User из БД.')
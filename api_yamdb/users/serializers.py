@@ -50,6 +50,8 @@ class TokenSerializer(AdminUserSerializer):
     """
     Serializer для токена.
     """
+    username = serializers.CharField(
+        max_length=MAX_LENGTH_USERNAME, required=True)
     confirmation_code = serializers.CharField(
         max_length=MAX_LENGTH_USERNAME, required=True)
 
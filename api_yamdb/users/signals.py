@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import drop_token_version, set_token_version
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Обновляет версию токенов пользователя в кеше."""
+    set_token_version(instance)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """Отзывает токены удалённого пользователя."""
+    drop_token_version(instance.pk)
@@ -6,10 +6,11 @@ from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
+from api.mixins import ConditionalGetMixin, SparseFieldsMixin
 from api_yamdb.settings import (DEFAULT_FROM_EMAIL, DEFAULT_SUBJECT_EMAIL,
                                 DEFAULT_TEXT_EMAIL)
+from .authentication import RoleAccessToken
 from .models import User
 from .permissions import IsAdmin
 from .serializers import (AdminUserSerializer, RegisterSerializer,
@@ -25,7 +26,11 @@ def send_confirmation_code(user):
                      [user.email])
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
     """Работа с данными для пользователя"""
     queryset = User.objects.all()
     serializer_class = AdminUserSerializer
@@ -45,11 +50,12 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def users_profile(self, request):
         """Профайл пользователя"""
-        serializer = self.get_serializer(request.user)
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
+            serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = self.get_serializer(
-            request.user, data=request.data, partial=True)
+            user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -80,6 +86,6 @@ def token(request):
     if not token_generator.check_token(
             user, serializer.data['confirmation_code']):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    token = AccessToken.for_user(user)
+    token = RoleAccessToken.for_user(user)
     return Response(
         {'token': str(token)}, status=status.HTTP_200_OK)
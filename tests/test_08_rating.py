@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Title
+from reviews.ratings import find_rating_mismatches
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_reviews(self, client, admin_client,
+                                       user_client, moderator_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг произведения без отзывов равен `None`.'
+        )
+
+        create_single_review(admin_client, title_id, 'text', 10)
+        response = create_single_review(user_client, title_id, 'text', 5)
+        create_single_review(moderator_client, title_id, 'text', 6)
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва.'
+        )
+
+        review_id = response.json()['id']
+        user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            data={'score': 8}
+        )
+        assert self.get_rating(client, title_id) == 8, (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки.'
+        )
+
+        user_client.delete(f'/api/v1/titles/{title_id}/reviews/{review_id}/')
+        assert self.get_rating(client, title_id) == 8, (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва.'
+        )
+
+        admin_client.delete('/api/v1/users/TestModerator/')
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что рейтинг пересчитывается при каскадном удалении '
+            'отзывов пользователя.'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (10, 1)
+
+    def test_02_rebuild_ratings_command(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 4)
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            4, 1, 4
+        ), 'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг.'
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(pk=title_id).update(rating=9)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        Title.objects.filter(pk=titles[1]['id']).update(rating=5)
+        assert set(find_rating_mismatches().values_list(
+            'pk', flat=True)) == {title_id, titles[1]['id']}, (
+            'Проверьте, что `rebuild_ratings --check` сверяет и сам рейтинг.'
+        )
+
+    def test_03_title_save_keeps_counters(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        title = Title.objects.get(pk=title_id)
+        create_single_review(user_client, title_id, 'text', 7)
+        title.name = 'Новое название'
+        title.save()
+        title = Title.objects.get(pk=title_id)
+        assert title.name == 'Новое название'
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            7, 1, 7
+        ), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг значениями, загруженными до нового отзыва.'
+        )
+        assert not find_rating_mismatches().exists()
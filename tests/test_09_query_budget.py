@@ -0,0 +1,77 @@
+import pytest
+
+from reviews.cache import category_cache, genre_cache
+from reviews.models import Category, Comment, Genre, Review, Title
+
+# Родительский объект, ETag, COUNT, страница (или жанры страницы).
+QUERY_BUDGET = 4
+OBJECTS_COUNT = 35
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    Genre.objects.bulk_create(
+        Genre(name=f'genre {idx}', slug=f'genre-{idx}') for idx in range(3)
+    )
+    Category.objects.bulk_create(
+        Category(name=f'category {idx}', slug=f'category-{idx}')
+        for idx in range(OBJECTS_COUNT)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'title {idx}', year=2000, category=category)
+        for idx, category in enumerate(Category.objects.all())
+    )
+    genres = list(Genre.objects.all())
+    for title in Title.objects.all():
+        title.genre.set(genres)
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(OBJECTS_COUNT)
+    )
+    title = Title.objects.order_by('pk').first()
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='text', score=5)
+        for author in django_user_model.objects.all()
+    )
+    review = Review.objects.order_by('pk').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text='text')
+        for author in django_user_model.objects.all()
+    )
+    # bulk_create не отправляет сигналы: прогреваем кеш справочников.
+    for dictionary_cache in (category_cache, genre_cache):
+        dictionary_cache.invalidate()
+        dictionary_cache.all()
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    def test_01_titles_list(self, client, catalog,
+                            django_assert_max_num_queries):
+        with django_assert_max_num_queries(QUERY_BUDGET):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) > 1, (
+            'Проверьте, что список произведений не пуст.'
+        )
+
+    def test_02_reviews_list(self, client, catalog,
+                             django_assert_max_num_queries):
+        title, _ = catalog
+        with django_assert_max_num_queries(QUERY_BUDGET):
+            response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert len(response.json()['results']) > 1, (
+            'Проверьте, что список отзывов не пуст.'
+        )
+
+    def test_03_comments_list(self, client, catalog,
+                              django_assert_max_num_queries):
+        title, review = catalog
+        with django_assert_max_num_queries(QUERY_BUDGET):
+            response = client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            )
+        assert len(response.json()['results']) > 1, (
+            'Проверьте, что список комментариев не пуст.'
+        )
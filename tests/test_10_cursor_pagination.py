@@ -0,0 +1,37 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_reviews_cursor_mode(self, client, admin_client, admin,
+                                    user_client, user, moderator_client,
+                                    moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and 'next' in data, (
+            f'Проверьте, что `{url}?pagination=cursor` возвращает курсорную '
+            'пагинацию без ключа `count`.'
+        )
+        assert [review['id'] for review in data['results']] == sorted(
+            (review['id'] for review in reviews), reverse=True
+        ), 'Проверьте, что отзывы упорядочены по (pub_date, id).'
+
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            f'Проверьте, что по умолчанию `{url}` использует пагинацию по '
+            'номеру страницы.'
+        )
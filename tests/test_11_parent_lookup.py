@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import ReviewSerializer
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ParentLookup:
+
+    def test_01_comment_review_belongs_to_title(self, client, admin_client,
+                                                admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что `/api/v1/titles/{title_id}/reviews/{review_id}/'
+            'comments/` возвращает 404, если отзыв не относится к '
+            'произведению.'
+        )
+        response = user_client.post(url, data={'text': 'text'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_review_post_single_title_lookup(
+            self, admin_client, admin, user_client, user):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # Пользователь, произведение, BEGIN, INSERT, рейтинг.
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(url, data={'text': 'text', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(queries) <= 5
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'reviews_review' in query['sql']
+            for query in queries.captured_queries
+        ), 'Проверьте, что повторный отзыв не ищется перед INSERT.'
+
+        response = user_client.post(url, data={'text': 'text', 'score': 7})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'non_field_errors' in response.json(), (
+            'Проверьте, что повторный отзыв отклоняется с ответом 400.'
+        )
+        assert Title.objects.get(pk=titles[0]['id']).rating_count == 2, (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг.'
+        )
+
+    def test_03_other_integrity_errors_not_reported_as_duplicate(self, user):
+        with pytest.raises(IntegrityError):
+            ReviewSerializer().create({
+                'text': 'text',
+                'score': 5,
+                'author': user,
+                'title': Title(pk=9999, name='Удалено', year=2000),
+            })
@@ -0,0 +1,83 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache.backends import locmem
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+from users.models import User
+
+
+def get_token_client(client, user):
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    token_client = APIClient()
+    token_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+    )
+    return token_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12StatelessAuth:
+
+    def test_01_no_user_lookup(self, client, admin, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        token_client = get_token_client(client, admin)
+        with CaptureQueriesContext(connection) as context:
+            response = token_client.patch(
+                f'/api/v1/titles/{titles[0]["id"]}/',
+                data={'name': 'Новое название'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'users_user' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что при аутентификации по токену с ролью '
+            'пользователь не загружается из БД.'
+        )
+
+    def test_02_role_change_revokes_token(self, client, user, admin_client):
+        token_client = get_token_client(client, user)
+        response = token_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = token_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли ранее выданный токен '
+            'отклоняется.'
+        )
+
+        token_client = get_token_client(client, user)
+        response = token_client.get('/api/v1/users/me/')
+        assert response.json()['role'] == 'moderator'
+
+    def test_03_version_cache_expires(self, client, user, monkeypatch):
+        token_client = get_token_client(client, user)
+        assert token_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK)
+        # Смена роли в другом процессе: кеш этого процесса не обновлён.
+        User.objects.filter(pk=user.pk).update(
+            role='moderator', token_version=F('token_version') + 1)
+        now = time.time()
+        monkeypatch.setattr(
+            locmem.time, 'time',
+            lambda: now + settings.TOKEN_VERSION_CACHE_TIMEOUT + 1)
+        response = token_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что версия токенов в кеше устаревает и '
+            'понижение роли доходит до всех процессов.'
+        )
@@ -0,0 +1,41 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13LoadData:
+
+    def test_01_load_data(self, django_user_model):
+        call_command('load_data', batch_size=7, stdout=StringIO())
+        expected = (
+            (django_user_model, 'users.csv'),
+            (Category, 'category.csv'),
+            (Genre, 'genre.csv'),
+            (Title, 'titles.csv'),
+            (Title.genre.through, 'genre_title.csv'),
+            (Review, 'review.csv'),
+            (Comment, 'comments.csv'),
+        )
+        for model, filename in expected:
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что команда `load_data` загружает `{filename}`.'
+            )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `load_data` сохраняет дату публикации из CSV.'
+        )
+        call_command('rebuild_ratings', '--check', stdout=StringIO())
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews import cache as cache_module
+from reviews.cache import category_cache, genre_cache, get_shared_version
+from reviews.models import Category
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14DictionaryCache:
+
+    def test_01_titles_without_dictionary_queries(self, client,
+                                                  admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/', {'genre': 'horror'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 1
+        assert not any(
+            'reviews_category' in query['sql']
+            or '"reviews_genre"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что категории и жанры берутся из кеша справочников.'
+        )
+
+    def test_02_cache_invalidation(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        category = Category.objects.get(slug=categories[0]['slug'])
+        category.name = 'Кино'
+        category.save()
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['category']['name'] == 'Кино', (
+            'Проверьте, что кеш категорий сбрасывается при их изменении.'
+        )
+
+    def test_03_title_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        cases = (
+            ({'genre': f'{genres[0]["slug"]},{genres[1]["slug"]}'}, 1),
+            ({'genre': f'{genres[0]["slug"]},{genres[2]["slug"]}'}, 2),
+            ({'genre': genres[0]['slug'][:3]}, 0),
+            ({'category': categories[1]['slug']}, 1),
+            ({'year': 198}, 0),
+            ({'year_min': 1985}, 1),
+            ({'year_min': 1980, 'year_max': 1990}, 2),
+        )
+        for params, expected in cases:
+            response = client.get('/api/v1/titles/', params)
+            assert response.json()['count'] == expected, (
+                f'Проверьте фильтрацию произведений по параметрам {params}.'
+            )
+
+    def test_04_version_checked_once_per_request(self, client, admin_client,
+                                                 monkeypatch):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        calls = []
+        original_get = cache.get
+        monkeypatch.setattr(cache, 'get', lambda key, *args, **kwargs: (
+            calls.append(key) or original_get(key, *args, **kwargs)))
+        client.get('/api/v1/titles/', {'uncached': 1})
+        for dictionary_cache in (category_cache, genre_cache):
+            assert calls.count(dictionary_cache.version_key) <= 1, (
+                'Проверьте, что версия справочника читается из общего '
+                'кеша не чаще одного раза за запрос.'
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            for number in range(3):
+                client.get('/api/v1/titles/', {'genre': f'unknown-{number}'})
+        assert sum(
+            '"reviews_genre"' in query['sql']
+            for query in context.captured_queries
+        ) <= 1, (
+            'Проверьте, что неизвестный slug не перечитывает справочник '
+            'при каждом запросе.'
+        )
+
+    def test_05_invalidated_after_commit(self, admin_client):
+        create_titles(admin_client)
+        version = get_shared_version(category_cache.version_key)
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            assert get_shared_version(
+                category_cache.version_key) == version, (
+                'Проверьте, что кеш справочника сбрасывается только после '
+                'фиксации транзакции.'
+            )
+        assert get_shared_version(category_cache.version_key) != version
+        assert category_cache.get_by_slug('music') is not None
+
+    def test_06_reloaded_after_timeout(self, admin_client, monkeypatch):
+        _, categories, _ = create_titles(admin_client)
+        slug = categories[0]['slug']
+        category_cache.get_by_slug(slug)
+        # Переименование в другом процессе: версия в кеше этого
+        # процесса не меняется.
+        Category.objects.filter(slug=slug).update(name='Кино')
+        assert category_cache.get_by_slug(slug).name != 'Кино'
+        now = cache_module.monotonic()
+        monkeypatch.setattr(
+            cache_module, 'monotonic',
+            lambda: now + settings.DICTIONARY_CACHE_TIMEOUT + 1)
+        assert category_cache.get_by_slug(slug).name == 'Кино', (
+            'Проверьте, что справочник перечитывается по истечении '
+            'DICTIONARY_CACHE_TIMEOUT.'
+        )
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from reviews.cache import get_catalog_generation
+from reviews.models import Category
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ResponseCache:
+
+    @pytest.mark.parametrize(
+        'url', ('/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/')
+    )
+    def test_01_anonymous_get_cached(self, url, client, admin_client,
+                                     django_assert_num_queries):
+        create_titles(admin_client)
+        first = client.get(url, {'search': '', 'name': ''})
+        with django_assert_num_queries(0):
+            second = client.get(url, {'name': '', 'search': ''})
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json(), (
+            f'Проверьте, что анонимный GET-запрос к `{url}` отдаётся из кеша.'
+        )
+        for header in ('Vary', 'Allow'):
+            assert second.get(header) == first.get(header) is not None, (
+                f'Проверьте, что ответ из кеша сохраняет заголовок {header}.'
+            )
+
+    def test_02_invalidated_by_review(self, client, admin_client,
+                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        create_single_review(user_client, titles[0]['id'], 'text', 9)
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что кеш ответов сбрасывается при изменении отзывов.'
+        )
+
+    def test_03_generation_bumped_after_commit(self, admin_client):
+        create_titles(admin_client)
+        generation = get_catalog_generation()
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            assert get_catalog_generation() == generation, (
+                'Проверьте, что поколение каталога меняется только после '
+                'фиксации транзакции.'
+            )
+        assert get_catalog_generation() != generation
@@ -0,0 +1,118 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.utils.http import http_date
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    def test_01_not_modified(self, client, admin_client, admin,
+                             django_assert_max_num_queries):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        urls = (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        )
+        for url in urls:
+            response = admin_client.get(url)
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+            )
+            # Пользователь, родительский объект, ETag.
+            with django_assert_max_num_queries(3):
+                response = admin_client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag'])
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                'If-None-Match возвращает 304.'
+            )
+
+    def test_02_etag_changes(self, client, admin_client):
+        response = admin_client.get('/api/v1/users/')
+        etag = response['ETag']
+        admin_client.patch('/api/v1/users/TestAdmin/', data={'bio': 'new'})
+        response = admin_client.get(
+            '/api/v1/users/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag меняется при изменении данных.'
+        )
+
+        etag = client.get('/api/v1/categories/')['ETag']
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        response = client.get(
+            '/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_deletes_without_last_modified(self, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review_url = '{}{}/'.format(
+            reviews_url,
+            admin_client.get(reviews_url).json()['results'][0]['id'],
+        )
+        response = admin_client.get(review_url)
+        assert response.has_header('Last-Modified')
+        assert admin_client.get(
+            review_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        for url, delete_url in (
+            ('/api/v1/categories/', '/api/v1/categories/films/'),
+            (reviews_url, review_url),
+        ):
+            response = admin_client.get(url)
+            assert not response.has_header('Last-Modified'), (
+                f'Проверьте, что список `{url}` не отдаёт Last-Modified: '
+                'удаление не меняет максимальную дату изменения.'
+            )
+            admin_client.delete(delete_url)
+            response = admin_client.get(
+                url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после удаления GET-запрос к `{url}` '
+                'с If-Modified-Since не возвращает 304.'
+            )
+
+    def test_04_related_changes(self, admin_client, admin, user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client})
+        title = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        url = f'/api/v1/titles/{title["id"]}/'
+        for dictionary, slug in (
+            ('categories', title['category']['slug']),
+            ('genres', title['genre'][0]['slug']),
+        ):
+            etag = admin_client.get(url)['ETag']
+            admin_client.delete(f'/api/v1/{dictionary}/{slug}/')
+            response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что ETag произведения меняется при удалении '
+                'его категории или жанра.'
+            )
+
+        url = f'{url}reviews/'
+        etag = admin_client.get(url)['ETag']
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'})
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag отзывов меняется при изменении автора.'
+        )
+        assert 'renamed' in {
+            review['author'] for review in response.json()['results']}
+
+    def test_05_invalid_pk(self, admin_client):
+        for url in ('/api/v1/titles/abc/',):
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с некорректным id '
+                'возвращает 404.'
+            )
@@ -0,0 +1,43 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleSearch:
+
+    def test_01_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        cases = (
+            ('терминат', [titles[0]['id']]),
+            ('КРЕПКИЙ', [titles[1]['id']]),
+            ('yippie', [titles[1]['id']]),
+            ('back терминатор', [titles[0]['id']]),
+            ('матрица', []),
+        )
+        for query, expected in cases:
+            response = client.get(url, {'search': query})
+            assert response.status_code == HTTPStatus.OK
+            assert [
+                title['id'] for title in response.json()['results']
+            ] == expected, (
+                f'Проверьте, что `{url}?search={query}` ищет по названию и '
+                'описанию произведения.'
+            )
+
+    def test_02_search_after_update_and_delete(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        admin_client.patch(
+            f'{url}{titles[0]["id"]}/', data={'name': 'Матрица'})
+        response = client.get(url, {'search': 'матрица'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(f'{url}{titles[0]["id"]}/')
+        response = client.get(url, {'search': 'матрица'})
+        assert response.json()['count'] == 0
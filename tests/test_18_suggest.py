@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Suggest:
+    url = '/api/v1/suggest/'
+
+    def test_01_suggest(self, client, admin_client,
+                        django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.url, {'q': 'кре'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [
+            {'type': 'title', 'id': titles[1]['id'], 'name': 'Крепкий орешек'}
+        ], f'Проверьте, что `{self.url}` ищет по префиксу названия.'
+
+        with django_assert_num_queries(0):
+            response = client.get(self.url, {'q': 'ОРЕШ'})
+        assert [item['name'] for item in response.json()] == [
+            'Крепкий орешек'
+        ], f'Проверьте, что `{self.url}` ищет по префиксу любого слова.'
+
+        response = client.get(self.url, {'q': 'ко', 'type': 'genre'})
+        assert response.json() == [
+            {'type': 'genre', 'slug': 'comedy', 'name': 'Комедия'}
+        ]
+        response = client.get(self.url, {'q': 'к', 'limit': 2})
+        assert len(response.json()) == 2
+
+    def test_02_suggest_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.url, {'q': 'тер'})
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'})
+        assert client.get(self.url, {'q': 'тер'}).json() == []
+        assert len(client.get(self.url, {'q': 'чуж'}).json()) == 1
+        admin_client.delete('/api/v1/genres/horror/')
+        assert client.get(self.url, {'q': 'ужас'}).json() == []
+
+    def test_03_suggest_bad_params(self, client):
+        for params in ({'q': 'a', 'limit': 'x'}, {'q': 'a', 'type': 'user'}):
+            response = client.get(self.url, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,41 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleOrdering:
+
+    def test_01_ordering(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'text', 4)
+        create_single_review(user_client, first, 'text', 6)
+        create_single_review(user_client, second, 'text', 9)
+        url = '/api/v1/titles/'
+        cases = (
+            ('-rating', [second, first]),
+            ('rating', [first, second]),
+            ('-review_count', [first, second]),
+            ('-year', [second, first]),
+            ('name', [second, first]),
+        )
+        for ordering, expected in cases:
+            response = client.get(url, {'ordering': ordering})
+            assert response.status_code == HTTPStatus.OK
+            assert [
+                title['id'] for title in response.json()['results']
+            ] == expected, (
+                f'Проверьте сортировку `{url}?ordering={ordering}`.'
+            )
+
+    def test_02_ordering_whitelist(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'ordering': 'description'})
+        names = [title['name'] for title in response.json()['results']]
+        assert names == sorted(names), (
+            'Проверьте, что сортировка по полям не из списка '
+            '`ordering_fields` игнорируется.'
+        )
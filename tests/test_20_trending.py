@@ -0,0 +1,49 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Review, TrendingTitle
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Trending:
+    url = '/api/v1/titles/trending/'
+
+    def test_01_trending(self, client, admin_client, user_client,
+                         moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'text', 5)
+        create_single_review(user_client, first, 'text', 5)
+        create_single_review(moderator_client, second, 'text', 5)
+        Review.objects.filter(title_id=first).update(
+            pub_date=timezone.now() - timedelta(days=60))
+
+        assert client.get(self.url).json() == [], (
+            'Проверьте, что до пересчёта популярности список пуст.'
+        )
+        call_command('refresh_trending', stdout=StringIO())
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [
+            second, first
+        ], (
+            f'Проверьте, что `{self.url}` упорядочивает произведения по '
+            'популярности с учётом давности отзывов.'
+        )
+
+        admin_client.delete('/api/v1/users/TestModerator/')
+        create_single_review(admin_client, second, 'text', 5)
+        score = TrendingTitle.objects.get(pk=second).score
+        call_command('refresh_trending', stdout=StringIO())
+        assert TrendingTitle.objects.get(pk=second).score > score, (
+            'Проверьте, что повторный пересчёт учитывает только новые отзывы.'
+        )
+        call_command('refresh_trending', '--full', stdout=StringIO())
+        assert TrendingTitle.objects.get(pk=second).score == pytest.approx(
+            1, rel=1e-3)
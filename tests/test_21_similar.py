@@ -0,0 +1,67 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Similar:
+    url = '/api/v1/titles/{title_id}/similar/'
+
+    def similar_ids(self, client, title_id):
+        response = client.get(self.url.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к '
+            '`/api/v1/titles/{title_id}/similar/` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [title['id'] for title in response.json()]
+
+    def test_01_similar(self, client, admin_client, user_client,
+                        moderator_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужие',
+            'year': 1986,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        first, second = titles[0]['id'], titles[1]['id']
+        third = response.json()['id']
+        for author_client in (admin_client, user_client, moderator_client):
+            create_single_review(author_client, first, 'text', 5)
+        create_single_review(admin_client, second, 'text', 5)
+        create_single_review(moderator_client, second, 'text', 5)
+        create_single_review(user_client, third, 'text', 5)
+
+        assert self.similar_ids(client, first) == [], (
+            'Проверьте, что до пересчёта список похожих произведений пуст.'
+        )
+        call_command('refresh_similar', stdout=StringIO())
+        assert self.similar_ids(client, first) == [second, third], (
+            'Проверьте, что похожие произведения упорядочены '
+            'по сходству оценок общих рецензентов.'
+        )
+        assert self.similar_ids(client, second) == [first], (
+            'Проверьте, что произведения без общих рецензентов '
+            'не попадают в список похожих.'
+        )
+        for title_id in (9999, 'abc'):
+            assert client.get(
+                self.url.format(title_id=title_id)
+            ).status_code == HTTPStatus.NOT_FOUND
+
+        create_single_review(user_client, second, 'text', 5)
+        call_command('refresh_similar', stdout=StringIO())
+        assert third in self.similar_ids(client, second), (
+            'Проверьте, что повторный пересчёт учитывает новые отзывы.'
+        )
+        assert second in self.similar_ids(client, third), (
+            'Проверьте, что повторный пересчёт обновляет списки соседей '
+            'произведений без новых отзывов.'
+        )
+        call_command('refresh_similar', '--full', stdout=StringIO())
+        assert self.similar_ids(client, second)[0] == first
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+def histogram(**counts):
+    return {str(score): counts.get(f's{score}', 0) for score in range(1, 11)}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleStats:
+
+    def get_stats(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/stats/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/stats/` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_stats_follow_reviews(self, client, admin_client, user_client,
+                                     moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_stats(client, title_id) == {
+            'count': 0, 'mean': None, 'median': None,
+            'histogram': histogram(),
+        }, 'Проверьте статистику произведения без отзывов.'
+
+        create_single_review(admin_client, title_id, 'text', 10)
+        response = create_single_review(user_client, title_id, 'text', 5)
+        create_single_review(moderator_client, title_id, 'text', 6)
+        assert self.get_stats(client, title_id) == {
+            'count': 3, 'mean': 7, 'median': 6,
+            'histogram': histogram(s5=1, s6=1, s10=1),
+        }, 'Проверьте, что статистика обновляется при создании отзыва.'
+
+        review_id = response.json()['id']
+        user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            data={'score': 8}
+        )
+        assert self.get_stats(client, title_id) == {
+            'count': 3, 'mean': 8, 'median': 8,
+            'histogram': histogram(s6=1, s8=1, s10=1),
+        }, 'Проверьте, что статистика обновляется при изменении оценки.'
+
+        admin_client.delete('/api/v1/users/TestModerator/')
+        assert self.get_stats(client, title_id) == {
+            'count': 2, 'mean': 9, 'median': 9,
+            'histogram': histogram(s8=1, s10=1),
+        }, 'Проверьте, что статистика обновляется при удалении отзывов.'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                f'/api/v1/titles/{title_id}/stats/?uncached=1')
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1, (
+            'Проверьте, что статистика читается одним запросом '
+            'без обращения к отзывам.'
+        )
+        for title_id in (9999, 'abc'):
+            assert client.get(
+                f'/api/v1/titles/{title_id}/stats/'
+            ).status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что статистика несуществующего произведения '
+                'или с некорректным id возвращает 404.'
+            )
+
+    def test_02_rebuild_ratings_restores_histogram(self, admin_client,
+                                                   user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 4)
+        Title.objects.filter(pk=title_id).update(score_4_count=0)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        call_command('rebuild_ratings')
+        assert Title.objects.get(pk=title_id).score_4_count == 1
+        call_command('rebuild_ratings', '--check')
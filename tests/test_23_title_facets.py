@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleFacets:
+    url = '/api/v1/titles/'
+
+    def test_01_facets(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        admin_client.post(self.url, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+
+        response = admin_client.get(
+            f'{self.url}?facets=genre,category,decade')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == 3
+        assert data['facets'] == {
+            'genre': {'horror': 2, 'comedy': 1, 'drama': 1},
+            'category': {'films': 2, 'books': 1},
+            'decade': {'1970': 1, '1980': 2},
+        }, (
+            f'Проверьте, что `{self.url}?facets=` возвращает количество '
+            'произведений по жанрам, категориям и десятилетиям.'
+        )
+        assert 'facets' not in admin_client.get(self.url).json(), (
+            'Проверьте, что фасеты возвращаются только по запросу.'
+        )
+
+        response = admin_client.get(
+            f'{self.url}?facets=genre,decade&category=films&page=1')
+        assert response.json()['facets'] == {
+            'genre': {'horror': 2, 'comedy': 1},
+            'decade': {'1970': 1, '1980': 1},
+        }, 'Проверьте, что фасеты считаются для отфильтрованной выборки.'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(
+                f'{self.url}?facets=genre,decade&category=films'
+                '&ordering=-year')
+        assert response.json()['facets']['decade'] == {'1970': 1, '1980': 1}
+        assert not any(
+            'GROUP BY' in query['sql'] for query in queries.captured_queries
+        ), 'Проверьте, что фасеты кешируются по набору фильтров.'
+
+        assert admin_client.get(
+            f'{self.url}?facets=rating'
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_facets_follow_catalog(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'{self.url}?facets=genre'
+        assert client.get(url).json()['facets']['genre'] == {
+            'comedy': 1, 'drama': 1, 'horror': 1}
+        admin_client.patch(
+            f'{self.url}{titles[1]["id"]}/',
+            data={'genre': [genres[0]['slug']]}
+        )
+        assert client.get(url).json()['facets']['genre'] == {
+            'horror': 2, 'comedy': 1}, (
+            'Проверьте, что фасеты пересчитываются при изменении каталога.'
+        )
@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+from tests.utils import create_categories, create_genre, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Bulk:
+
+    def test_01_bulk_create_dictionaries(self, admin_client, user_client):
+        create_categories(admin_client)
+        data = [
+            {'name': 'Музыка', 'slug': 'music'},
+            {'name': 'Игры', 'slug': 'games'},
+        ]
+        assert user_client.post(
+            '/api/v1/categories/', data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.post(
+            '/api/v1/categories/', data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос администратора со списком объектов '
+            'к `/api/v1/categories/` создаёт их все.'
+        )
+        assert response.json() == data
+        assert Category.objects.count() == 4
+
+        response = admin_client.post('/api/v1/genres/', data=[
+            {'name': 'Ужасы', 'slug': 'horror'},
+            {'name': 'Комедия', 'slug': 'horror'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторяющиеся slug отклоняют весь список.'
+        )
+        assert not Genre.objects.exists()
+        response = admin_client.post('/api/v1/genres/', data=[
+            {'name': 'Фильм', 'slug': 'films'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = admin_client.post(
+            '/api/v1/categories/bulk-delete/',
+            data={'slugs': ['music', 'games', 'unknown']},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'deleted': 2}
+        assert set(Category.objects.values_list('slug', flat=True)) == {
+            'films', 'books'}
+        assert admin_client.get('/api/v1/categories/').json()['count'] == 2
+        assert admin_client.post(
+            '/api/v1/categories/bulk-delete/', data={'slugs': []},
+            format='json',
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_bulk_create_titles(self, client, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        data = [
+            {
+                'name': f'Фильм {number}',
+                'year': 2000 + number,
+                'category': 'films',
+                'genre': ['horror', 'drama'] if number % 2 else ['comedy'],
+            }
+            for number in range(20)
+        ]
+        admin_client.get('/api/v1/genres/')
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(
+                '/api/v1/titles/', data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        assert len(queries) < 20, (
+            'Проверьте, что произведения создаются пачкой, '
+            'а не отдельным запросом на каждое.'
+        )
+        created = response.json()
+        assert [title['name'] for title in created] == [
+            title['name'] for title in data]
+        single = admin_client.post('/api/v1/titles/', data={
+            'name': 'Одиночный', 'year': 2000, 'category': 'films',
+            'genre': ['horror', 'drama'],
+        }, format='json').json()
+        assert set(created[1]) == set(single), (
+            'Проверьте, что создание списком отвечает в том же формате, '
+            'что и создание одного произведения.'
+        )
+        assert created[1]['category'] == single['category'] == 'films'
+        assert sorted(created[1]['genre']) == sorted(single['genre']) == [
+            'drama', 'horror']
+        Title.objects.filter(pk=single['id']).delete()
+        assert Title.objects.count() == 20
+        assert Title.genre.through.objects.count() == 30
+        title = client.get(f'/api/v1/titles/{created[1]["id"]}/').json()
+        assert title['name'] == 'Фильм 1'
+        assert [genre['slug'] for genre in title['genre']] == [
+            'drama', 'horror']
+        assert title['category']['slug'] == 'films'
+        assert client.get(
+            '/api/v1/titles/?search=Фильм'
+        ).json()['count'] == 20, (
+            'Проверьте, что созданные пачкой произведения попадают '
+            'в полнотекстовый поиск.'
+        )
+        assert client.get('/api/v1/suggest/?q=фил').json(), (
+            'Проверьте, что созданные пачкой произведения попадают '
+            'в автодополнение.'
+        )
+
+        response = admin_client.post('/api/v1/titles/', data=[
+            {'name': 'A', 'year': 2000, 'category': 'films', 'genre': []},
+            {'name': 'B', 'year': 2000, 'category': 'nope', 'genre': []},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert Title.objects.count() == 20
+
+    def test_03_bulk_delete_titles(self, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        response = admin_client.post(
+            '/api/v1/titles/bulk-delete/',
+            data={'ids': [title['id'] for title in titles]},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'deleted': len(titles)}
+        assert not Title.objects.exists()
+        assert not Review.objects.exists()
+        assert admin_client.post(
+            '/api/v1/titles/bulk-delete/', data={'ids': ['x']},
+            format='json',
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_create_titles_without_returned_pks(self, admin_client,
+                                                        monkeypatch):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        # Бэкенд, который не возвращает pk из INSERT и не держит
+        # блокировку таблицы (MySQL): pk нельзя брать по порядку id.
+        monkeypatch.setattr(connection, 'vendor', 'mysql')
+        response = admin_client.post('/api/v1/titles/', data=[
+            {'name': 'Первый', 'year': 2000, 'category': 'films',
+             'genre': ['comedy']},
+            {'name': 'Второй', 'year': 2001, 'category': 'films',
+             'genre': ['drama']},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        for title in response.json():
+            assert Title.objects.get(pk=title['id']).name == title['name']
+        assert set(Title.genre.through.objects.values_list(
+            'title__name', 'genre__slug'
+        )) == {('Первый', 'comedy'), ('Второй', 'drama')}, (
+            'Проверьте, что жанры привязываются к созданным произведениям.'
+        )
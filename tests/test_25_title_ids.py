@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TitleIds:
+    url = '/api/v1/titles/'
+
+    def test_01_ids(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, second, 'text', 7)
+
+        client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'{self.url}?ids={second},9999,{first}')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [second, first], (
+            f'Проверьте, что `{self.url}?ids=` возвращает произведения '
+            'в порядке запроса.'
+        )
+        assert results[0]['rating'] == 7
+        assert results[1]['category']['slug'] == titles[0]['category']
+        assert sorted(genre['slug'] for genre in results[1]['genre']) == (
+            sorted(titles[0]['genre']))
+        assert sum(
+            'FROM "reviews_title"' in query['sql']
+            and 'COUNT' not in query['sql']
+            and 'MAX' not in query['sql']
+            for query in queries.captured_queries
+        ) == 1, 'Проверьте, что произведения загружаются одним запросом.'
+
+        response = client.get(f'{self.url}?ids={first},{second}'
+                              '&ordering=-year')
+        assert [title['id'] for title in response.json()['results']] == [
+            second, first]
+
+    def test_02_ids_validation(self, client):
+        for ids in ('', 'a,b', ','.join(map(str, range(1, 100)))):
+            response = client.get(f'{self.url}?ids={ids}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.url}?ids={ids[:20]}` '
+                'возвращает ответ со статусом 400.'
+            )
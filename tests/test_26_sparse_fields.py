@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_titles
+
+
+def title_selects(queries):
+    return [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "reviews_title"' in query['sql']
+        and 'COUNT(' not in query['sql'] and 'MAX(' not in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SparseFields:
+
+    def test_01_titles(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/titles/?fields=name,id')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [
+            {'id': title['id'], 'name': title['name']}
+            for title in sorted(titles, key=lambda title: title['name'])
+        ], (
+            'Проверьте, что `fields=` оставляет в ответе только '
+            'запрошенные поля в порядке сериализатора.'
+        )
+        selects = title_selects(queries)
+        assert selects and all(
+            'description' not in sql for sql in selects), (
+            'Проверьте, что `fields=` сокращает список загружаемых столбцов.'
+        )
+        assert not any(
+            'reviews_title_genre' in query['sql']
+            for query in queries.captured_queries
+        ), 'Проверьте, что жанры не загружаются, если они не запрошены.'
+
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?fields=category,genre')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert set(data) == {'category', 'genre'}
+        assert data['category']['slug'] == titles[0]['category']
+        assert len(data['genre']) == 2
+
+        assert client.get(
+            '/api/v1/titles/?fields=password'
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_reviews_comments_users(self, client, admin_client, admin,
+                                       user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        reviews = client.get(f'{url}?fields=author,score').json()['results']
+        assert reviews and all(
+            set(review) == {'author', 'score'} for review in reviews)
+        assert {review['author'] for review in reviews} <= {
+            admin.username, user.username}
+        with CaptureQueriesContext(connection) as queries:
+            reviews = client.get(f'{url}?fields=id,text').json()['results']
+        assert all(set(review) == {'id', 'text'} for review in reviews)
+        assert not any(
+            'users_user' in query['sql']
+            for query in queries.captured_queries
+        ), 'Проверьте, что автор не загружается, если он не запрошен.'
+
+        review_id = reviews[0]['id']
+        response = user_client.post(
+            f'{url}{review_id}/comments/', data={'text': 'comment'})
+        assert response.status_code == HTTPStatus.CREATED
+        comments = client.get(
+            f'{url}{review_id}/comments/?fields=text,author'
+        ).json()['results']
+        assert comments == [{'text': 'comment', 'author': user.username}]
+
+        response = admin_client.get('/api/v1/users/?fields=username,role')
+        assert response.status_code == HTTPStatus.OK
+        assert all(
+            set(item) == {'username', 'role'}
+            for item in response.json()['results']
+        )
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from tests.utils import create_titles
+
+
+class Test27JSONRenderer:
+    data = {
+        'name': 'Ёжик в тумане',
+        'pub_date': datetime(2023, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        'score': Decimal('7.5'),
+        'separators': 'a\u2028b\u2029c',
+        1: [None, True, 1.5],
+    }
+
+    def test_01_renderer_parity(self):
+        assert ORJSONRenderer().render(self.data) == JSONRenderer().render(
+            self.data), (
+            'Проверьте, что ORJSONRenderer выдаёт те же байты, '
+            'что и JSONRenderer.'
+        )
+        assert 'Ёжик'.encode() in ORJSONRenderer().render(self.data)
+        assert ORJSONRenderer().render(None) == b''
+        assert ORJSONRenderer().render(
+            {'a': 1}, 'application/json; indent=2'
+        ) == JSONRenderer().render({'a': 1}, 'application/json; indent=2')
+
+    def test_02_parser(self):
+        content = JSONRenderer().render({'name': 'Ёжик', 'genre': ['drama']})
+        assert ORJSONParser().parse(BytesIO(content)) == JSONParser().parse(
+            BytesIO(content))
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"name":'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Ёжик в тумане',
+            'year': 1975,
+            'genre': ['drama'],
+            'category': 'films',
+        }, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(f'/api/v1/titles/{response.json()["id"]}/')
+        assert 'Ёжик в тумане'.encode() in response.content
+        assert response['Content-Type'] == 'application/json'
+
+    def test_04_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_json', '--repeat', '1', stdout=out)
+        assert 'orjson' in out.getvalue()
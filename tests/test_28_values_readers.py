@@ -0,0 +1,54 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.readers import comment_reader, review_reader, title_reader
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from reviews.models import Comment, Review, Title
+from tests.utils import create_comments
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ValuesReaders:
+
+    def create_data(self, admin_client, admin, user_client, user):
+        create_comments(
+            admin_client, {admin: admin_client, user: user_client})
+        Title.objects.create(name='Без категории', year=2000)
+
+    @pytest.mark.parametrize('reader, serializer_class, queryset', (
+        (title_reader, TitleReadSerializer, Title.objects.order_by('id')),
+        (review_reader, ReviewSerializer, Review.objects.order_by('id')),
+        (comment_reader, CommentSerializer, Comment.objects.order_by('id')),
+    ))
+    def test_01_parity(self, admin_client, admin, user_client, user,
+                       reader, serializer_class, queryset):
+        self.create_data(admin_client, admin, user_client, user)
+        queryset = queryset.all()
+        assert queryset.exists()
+        expected = render(serializer_class(queryset, many=True).data)
+        assert render(reader.read(reader.values(queryset))) == expected, (
+            'Проверьте, что быстрый путь чтения выдаёт те же байты, '
+            f'что и {serializer_class.__name__}.'
+        )
+
+        fields = list(serializer_class().fields)[1::2]
+        serializer = serializer_class(queryset, many=True)
+        for name in set(serializer.child.fields) - set(fields):
+            del serializer.child.fields[name]
+        assert render(
+            reader.read(reader.values(queryset, fields), fields)
+        ) == render(serializer.data)
+
+    def test_02_api_uses_reader(self, client, admin_client, admin,
+                                user_client, user):
+        self.create_data(admin_client, admin, user_client, user)
+        title = Title.objects.filter(reviews__isnull=False).first()
+        response = client.get(f'/api/v1/titles/{title.pk}/reviews/')
+        expected = ReviewSerializer(
+            title.reviews.order_by('-pub_date'), many=True).data
+        assert render(response.json()['results']) == render(expected)
@@ -0,0 +1,89 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from api import middleware
+from api.middleware import CompressionMiddleware, choose_encoding
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+def apply_middleware(response, accept_encoding='gzip'):
+    request = RequestFactory().get(
+        '/api/v1/titles/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+class Test29Compression:
+
+    def test_01_negotiation(self):
+        assert choose_encoding('') is None
+        assert choose_encoding('gzip, deflate') == 'gzip'
+        assert choose_encoding('gzip;q=0, identity') is None
+        assert choose_encoding('*;q=0.5') in middleware.ENCODINGS
+        if 'br' in middleware.ENCODINGS:
+            assert choose_encoding('gzip, br') == 'br'
+            assert choose_encoding('gzip;q=1, br;q=0.5') == 'gzip'
+
+    def test_02_threshold_and_streaming(self):
+        small = apply_middleware(
+            HttpResponse(b'{}', content_type='application/json'))
+        assert not small.has_header('Content-Encoding'), (
+            'Проверьте, что маленькие ответы не сжимаются.'
+        )
+        content = b'{"name":"\xd0\x81\xd0\xb6\xd0\xb8\xd0\xba"}' * 200
+        response = apply_middleware(
+            HttpResponse(content, content_type='application/json'))
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(response.content) == content
+
+        response = apply_middleware(StreamingHttpResponse(
+            (content for _ in range(5)), content_type='application/json'))
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(
+            b''.join(response.streaming_content)) == content * 5, (
+            'Проверьте сжатие потоковых ответов.'
+        )
+
+    def test_03_brotli(self):
+        brotli = pytest.importorskip('brotli')
+        content = b'{"text":"' + 'отзыв '.encode() * 500 + b'"}'
+        response = apply_middleware(
+            HttpResponse(content, content_type='application/json'), 'br')
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.content) == content
+
+    @override_settings(COMPRESSION_MIN_SIZE=10)
+    @pytest.mark.django_db(transaction=True)
+    def test_04_cached_variants(self, client, admin_client, monkeypatch):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        plain = client.get(url)
+        compressed = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert compressed.status_code == HTTPStatus.OK
+        assert compressed['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.content) == plain.content
+        assert compressed['ETag'] == 'W/' + plain['ETag']
+
+        calls = []
+        original = middleware.ENCODINGS['gzip']
+        monkeypatch.setitem(middleware.ENCODINGS, 'gzip', (
+            lambda content: calls.append(content) or original[0](content),
+            original[1],
+        ))
+        again = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert again.content == compressed.content
+        assert not calls, (
+            'Проверьте, что сжатый вариант ответа из кеша '
+            'не сжимается повторно.'
+        )
+        Title.objects.create(name='Новое', year=2000)
+        client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert len(calls) == 1, (
+            'Проверьте, что сжатые варианты сбрасываются вместе с кешем '
+            'ответов.'
+        )
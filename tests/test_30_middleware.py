@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import path
+
+captured = {}
+
+
+def probe(request):
+    captured['request'] = request
+    return HttpResponse()
+
+
+# Модуль служит URLconf для проверок без декораторов представлений.
+urlpatterns = [
+    path('probe/', probe),
+    path('api/probe/', probe),
+]
+
+
+class Test30Middleware:
+
+    @pytest.mark.urls(__name__)
+    def test_01_api_bypasses_session_stack(self, client):
+        client.get('/api/probe/')
+        request = captured['request']
+        assert not hasattr(request, 'session'), (
+            'Проверьте, что запросы к API не проходят через сессии.'
+        )
+        assert not hasattr(request, '_messages')
+        client.get('/probe/')
+        request = captured['request']
+        assert hasattr(request, 'session') and hasattr(request, 'user'), (
+            'Проверьте, что остальные страницы проходят через сессии '
+            'и аутентификацию Django.'
+        )
+
+    @pytest.mark.urls(__name__)
+    def test_02_csrf_outside_api(self):
+        client = Client(enforce_csrf_checks=True)
+        assert client.post('/probe/').status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что POST-запрос вне API без CSRF-токена '
+            'отклоняется.'
+        )
+        assert client.post('/api/probe/').status_code == HTTPStatus.OK
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_responses(self, client, user_superuser):
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert settings.CSRF_COOKIE_NAME not in response.cookies
+        assert settings.SESSION_COOKIE_NAME not in response.cookies
+        assert response['X-Frame-Options'] == 'DENY'
+
+        response = client.get('/admin/login/')
+        assert response.status_code == HTTPStatus.OK
+        assert settings.CSRF_COOKIE_NAME in response.cookies, (
+            'Проверьте, что админка по-прежнему защищена CSRF.'
+        )
+        client.force_login(user_superuser)
+        assert client.get('/admin/').status_code == HTTPStatus.OK, (
+            'Проверьте, что вход в админку по сессии работает.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_latency_report(self, capsys):
+        call_command('middleware_latency', requests=2, path=['/admin/login/'])
+        output = capsys.readouterr().out
+        assert 'SessionMiddleware' in output
+        assert 'NonApiSessionMiddleware' in output
+        assert 'итого middleware' in output